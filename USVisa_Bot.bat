@@ -15,7 +15,7 @@ REM   - Multi-location rotation (Location 1 + optional Location 2)
 REM   - No home navigation during retries (stays on appointment page)
 REM   - System busy detection only when calendar fails to open
 REM   - Faster check interval defaults
-REM   - Telegram notifications for each attempt number
+REM   - Telegram status summary every 5 minutes (dates are alerted immediately)
 REM   - Proper stop functionality (Stop button or /stop) closes Chrome and ends process
 REM ============================================================
 
@@ -35,7 +35,7 @@ echo   - Optimized calendar interactions (JavaScript-based)
 echo   - Multi-location rotation (Location 1 + optional Location 2)
 echo   - No home navigation during retries
 echo   - Real-time log monitoring
-echo   - Telegram notifications for each attempt number
+echo   - Telegram status summary every 5 minutes (dates are alerted immediately)
 echo   - Proper stop functionality (Stop button or /stop closes Chrome)
 echo.
 echo ============================================================
@@ -65,7 +65,7 @@ if errorlevel 1 (
     echo   - selenium
     echo   - python-telegram-bot
     echo   - python-dotenv
-    echo   - tkcalendar
+    echo   - psutil
     echo.
     echo ============================================================
     echo.
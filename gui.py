@@ -1,28 +1,105 @@
 #!/usr/bin/env python3
 """GUI version of US Visa Appointment Automation Bot."""
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
-from tkcalendar import DateEntry
+from tkinter import messagebox, scrolledtext, ttk
 import threading
+import queue
+import concurrent.futures
+import contextlib
+import logging
+import re
 import sys
 import os
-from datetime import datetime
+import traceback
+from datetime import date
 from typing import Dict, Any, Optional
 
-# Import settings for consulates and configuration
-from settings import CONSULATES, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, CHECK_INTERVAL
-from settings import EARLIEST_ACCEPTABLE_DATE, LATEST_ACCEPTABLE_DATE, CURRENT_BOOKING_DATE, USER_CONSULATE, USER_CONSULATE_2
+# Settings are loaded in VisaBotGUI.__init__, so `--help` doesn't read .env
+from settings import CONSULATE_NAMES, EMAIL_RE, get_settings
+
+# Shared styling constants for the dark theme
+DARK_BG = "#1e1e1e"
+LIGHT_FG = "#ffffff"
+FONT_10 = ("Arial", 10)
+FONT_10_BOLD = ("Arial", 10, "bold")
+# Shared widget options, built once and splatted into each constructor
+_ENTRY_KW = dict(width=40, font=FONT_10)
+_BUTTON_KW = dict(width=18, font=FONT_10_BOLD)
+# Shared date field options, built once for all three date entries
+_DATE_KW = dict(width=12, font=FONT_10, style="Date.TEntry", validate="focusout")
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+LOG_DRAIN_INTERVAL_MS = 50  # How often queued log messages are flushed to the log area
+LOG_DRAIN_MAX_ITEMS = 200  # Upper bound on messages written per drain tick, keeps the UI responsive
+LOG_MAX_LINES = 5000  # Scrollback cap for the log area
+LOG_TRIM_LINES = 1000  # Lines dropped from the top once the cap is exceeded
+
+# Third-party loggers only reach the GUI log at WARNING and above
+NOISY_LOGGERS = ("selenium", "urllib3", "httpx", "httpcore", "telegram")
+
+USAGE = """Usage: python gui.py
+
+Launches the US Visa Appointment Bot GUI.
+Defaults are read from the .env file (see env.example)."""
+
+
+def _date_ok(value: str) -> bool:
+    """Entry validatecommand: accept only YYYY-MM-DD text."""
+    return bool(_DATE_RE.match(value.strip()))
+
+
+def _parse_date_field(value: str) -> date:
+    """Parse a YYYY-MM-DD date entry value.
+    
+    Raises:
+        ValueError: If the value is not a valid YYYY-MM-DD date
+    """
+    value = value.strip()
+    if not _DATE_RE.match(value):
+        raise ValueError(f"'{value}' is not in YYYY-MM-DD format")
+    return date.fromisoformat(value)
+
+
+class _QueueLogHandler(logging.Handler):
+    """Logging handler that forwards formatted records to the GUI log queue."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__()
+        self._q = log_queue
+        self.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', '%H:%M:%S'))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and record.name.startswith(NOISY_LOGGERS):
+            return False
+        return super().filter(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._q.put(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class _LogWriter:
+    """File-like object that forwards complete lines of text to the GUI log queue."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        self.q = log_queue
+        self.buffer = ""
+
+    def write(self, text: str) -> None:
+        # Line-buffered: fragment writes are held until a newline arrives
+        self.buffer += text
+        if '\n' in text:
+            lines, _, self.buffer = self.buffer.rpartition('\n')
+            self.q.put_nowait(lines + '\n')
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.q.put_nowait(self.buffer + '\n')
+            self.buffer = ""
 
-# Default values (from settings.py or environment variables)
-# Note: Sensitive values like Telegram token should be in .env file, not hardcoded
-DEFAULT_TELEGRAM_TOKEN = TELEGRAM_BOT_TOKEN if TELEGRAM_BOT_TOKEN else os.getenv('TELEGRAM_BOT_TOKEN', '')
-DEFAULT_CHAT_ID = TELEGRAM_CHAT_ID if TELEGRAM_CHAT_ID else os.getenv('TELEGRAM_CHAT_ID', '2023815877')
-DEFAULT_CHECK_INTERVAL = CHECK_INTERVAL if CHECK_INTERVAL else 30
-DEFAULT_EARLIEST_DATE = EARLIEST_ACCEPTABLE_DATE if EARLIEST_ACCEPTABLE_DATE else '2026-01-31'
-DEFAULT_LATEST_DATE = LATEST_ACCEPTABLE_DATE if LATEST_ACCEPTABLE_DATE else '2026-12-31'
-DEFAULT_CURRENT_DATE = CURRENT_BOOKING_DATE if CURRENT_BOOKING_DATE else '2027-06-30'
-DEFAULT_LOCATION = USER_CONSULATE if USER_CONSULATE else 'Toronto'
-DEFAULT_LOCATION_2 = USER_CONSULATE_2 if USER_CONSULATE_2 else ''
 
 class VisaBotGUI:
     def __init__(self, root: tk.Tk) -> None:
@@ -32,93 +109,115 @@ class VisaBotGUI:
             root: Tkinter root window
         """
         self.root = root
+        # Configuration defaults (from settings.py or .env), loaded once here
+        self._settings = get_settings()
         self.root.title("US Visa Appointment Bot - GUI")
-        self.root.configure(bg="#1e1e1e")
+        self.root.configure(bg=DARK_BG)
+        
+        # Named ttk styles are resolved once by Tk instead of per-widget kwargs
+        style = ttk.Style(self.root)
+        style.configure("Dark.TLabel", background=DARK_BG, foreground=LIGHT_FG, font=FONT_10)
+        style.map("Date.TEntry", foreground=[("invalid", "#ff0000")])  # Flag malformed dates
         self.root.geometry("900x720")  # Slightly taller for updated info label
         
         # Process tracking
-        self.bot_thread: Optional[threading.Thread] = None
+        # Single reusable worker thread for bot runs
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="visa-bot")
+        self._future: Optional[concurrent.futures.Future] = None
         self.is_running = False
         self.stop_event = threading.Event()  # For proper thread stopping
+        self._validated_inputs: Optional[Dict[str, Any]] = None  # Set by start_bot
+        self._use_telegram = False  # Input mode captured by start_bot
+        self._browser_pid: Optional[int] = None  # chromedriver PID reported by main()
+        self._run_main = None  # main.main, preloaded in the background
+        self.root.protocol("WM_DELETE_WINDOW", self.confirm_quit)  # Window close goes through Quit
+        
+        # Log messages are queued (from any thread) and drained on the Tk main loop
+        self._log_queue: queue.Queue = queue.Queue()
         
         self.build_inputs()
         self.build_controls()
         self.build_log_area()
+        os.environ["USE_TELEGRAM_INPUTS"] = "false"  # Telegram toggle starts unchecked
+        if self._settings.issues:
+            # Bad .env values were replaced by defaults; say so once the window is up
+            self.root.after_idle(lambda: messagebox.showwarning(
+                "Settings",
+                "Some settings are invalid and were replaced by defaults:\n\n" + "\n".join(self._settings.issues),
+            ))
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_log)
+        
+        # Import main (selenium, telegram, ...) while the user fills in the form
+        self._preload_thread = threading.Thread(target=self._preload_main, daemon=True)
+        self._preload_thread.start()
+        
+    def _preload_main(self) -> None:
+        """Import main.main off the UI thread so Start does not stall on it."""
+        try:
+            from main import main
+            # main() imports these lazily; warm them here as well
+            import telegram_bot, telegram_inputs, visa_scraper  # noqa: F401
+            self._run_main = main
+        except Exception:
+            # run_bot retries the import and reports the error
+            pass
         
     def build_inputs(self) -> None:
         """Build input fields for the GUI."""
-        input_frame = tk.Frame(self.root, bg="#1e1e1e")
+        input_frame = tk.Frame(self.root, bg=DARK_BG)
         input_frame.grid(row=0, column=0, columnspan=4, padx=10, pady=10, sticky="ew")
         
         def label(text, row, col=0):
-            lbl = tk.Label(input_frame, text=text, bg="#1e1e1e", fg="#ffffff", font=("Arial", 10))
+            lbl = ttk.Label(input_frame, text=text, style="Dark.TLabel")
             lbl.grid(row=row, column=col, sticky="w", pady=5)
             return lbl
         
+        validate_date = (self.root.register(_date_ok), "%P")
+        
+        def date_entry(row, default):
+            entry = ttk.Entry(input_frame, validatecommand=validate_date, **_DATE_KW)
+            entry.insert(0, default)
+            entry.grid(row=row, column=1, sticky="w", padx=10, pady=5)
+            return entry
+        
         # Email
-        label("Email:", 0).grid(row=0, column=0, sticky="w", pady=5)
+        label("Email:", 0)
         self.email_var = tk.StringVar()
-        self.email_entry = tk.Entry(input_frame, textvariable=self.email_var, width=40, font=("Arial", 10))
+        self.email_entry = tk.Entry(input_frame, textvariable=self.email_var, **_ENTRY_KW)
         self.email_entry.grid(row=0, column=1, padx=10, pady=5, sticky="w")
         
         # Password
-        label("Password:", 1).grid(row=1, column=0, sticky="w", pady=5)
+        label("Password:", 1)
         self.password_var = tk.StringVar()
-        self.password_entry = tk.Entry(input_frame, textvariable=self.password_var, show="*", width=40, font=("Arial", 10))
+        self.password_entry = tk.Entry(input_frame, textvariable=self.password_var, show="*", **_ENTRY_KW)
         self.password_entry.grid(row=1, column=1, padx=10, pady=5, sticky="w")
         
         # Location 1
-        label("Location 1:", 2).grid(row=2, column=0, sticky="w", pady=5)
-        self.location_var = tk.StringVar(value=DEFAULT_LOCATION)
-        self.location_menu = tk.OptionMenu(input_frame, self.location_var, *CONSULATES.keys())
-        self.location_menu.config(width=37, font=("Arial", 10))
+        label("Location 1:", 2)
+        self.location_var = tk.StringVar(value=self._settings.user_consulate)
+        self.location_menu = ttk.Combobox(input_frame, textvariable=self.location_var, values=CONSULATE_NAMES,
+                                          state="readonly", width=37, font=FONT_10)
         self.location_menu.grid(row=2, column=1, padx=10, pady=5, sticky="w")
 
         # Location 2 (optional)
-        label("Location 2 (optional):", 3).grid(row=3, column=0, sticky="w", pady=5)
-        self.location_var_2 = tk.StringVar(value=DEFAULT_LOCATION_2)
-        self.location_menu_2 = tk.OptionMenu(input_frame, self.location_var_2, *CONSULATES.keys())
-        self.location_menu_2.config(width=37, font=("Arial", 10))
+        label("Location 2 (optional):", 3)
+        self.location_var_2 = tk.StringVar(value=self._settings.user_consulate_2)
+        # Leading blank entry lets the optional second location be cleared again
+        self.location_menu_2 = ttk.Combobox(input_frame, textvariable=self.location_var_2, values=("",) + CONSULATE_NAMES,
+                                            state="readonly", width=37, font=FONT_10)
         self.location_menu_2.grid(row=3, column=1, padx=10, pady=5, sticky="w")
         
         # Earliest Date
-        label("Earliest Date:", 4).grid(row=4, column=0, sticky="w", pady=5)
-        self.earliest_date = DateEntry(
-            input_frame, 
-            width=12, 
-            background="darkblue", 
-            foreground="white", 
-            date_pattern="yyyy-mm-dd",
-            font=("Arial", 10)
-        )
-        self.earliest_date.set_date(datetime.strptime(DEFAULT_EARLIEST_DATE, "%Y-%m-%d"))
-        self.earliest_date.grid(row=4, column=1, sticky="w", padx=10, pady=5)
+        label("Earliest Date:", 4)
+        self.earliest_date = date_entry(4, self._settings.earliest_acceptable_date)
         
         # Latest Date
-        label("Latest Date:", 5).grid(row=5, column=0, sticky="w", pady=5)
-        self.latest_date = DateEntry(
-            input_frame, 
-            width=12, 
-            background="darkblue", 
-            foreground="white", 
-            date_pattern="yyyy-mm-dd",
-            font=("Arial", 10)
-        )
-        self.latest_date.set_date(datetime.strptime(DEFAULT_LATEST_DATE, "%Y-%m-%d"))
-        self.latest_date.grid(row=5, column=1, sticky="w", padx=10, pady=5)
+        label("Latest Date:", 5)
+        self.latest_date = date_entry(5, self._settings.latest_acceptable_date)
         
         # Current Booking Date
-        label("Current Booking Date:", 6).grid(row=6, column=0, sticky="w", pady=5)
-        self.current_date = DateEntry(
-            input_frame, 
-            width=12, 
-            background="darkblue", 
-            foreground="white", 
-            date_pattern="yyyy-mm-dd",
-            font=("Arial", 10)
-        )
-        self.current_date.set_date(datetime.strptime(DEFAULT_CURRENT_DATE, "%Y-%m-%d"))
-        self.current_date.grid(row=6, column=1, sticky="w", padx=10, pady=5)
+        label("Current Booking Date:", 6)
+        self.current_date = date_entry(6, self._settings.current_booking_date)
 
         # Telegram input toggle
         self.use_telegram_var = tk.BooleanVar(value=False)
@@ -127,9 +226,9 @@ class VisaBotGUI:
             text="Use Telegram Inputs (override GUI fields)",
             variable=self.use_telegram_var,
             command=self._toggle_input_mode,
-            bg="#1e1e1e",
-            fg="#ffffff",
-            selectcolor="#1e1e1e",
+            bg=DARK_BG,
+            fg=LIGHT_FG,
+            selectcolor=DARK_BG,
             font=("Arial", 9)
         )
         self.telegram_toggle.grid(row=7, column=0, columnspan=2, pady=5, sticky="w")
@@ -137,8 +236,8 @@ class VisaBotGUI:
         # Info label
         info_label = tk.Label(
             input_frame, 
-            text="Note: Telegram Token should be set in .env file. Chat ID, Check Interval (5s) use defaults from settings.\nChrome browser will be visible (not headless). Console window shows detailed logs.\nYou will receive Telegram notifications for each attempt number. Stop button and /stop command close Chrome and end the process.\nToggle 'Use Telegram Inputs' to answer prompts in Telegram instead of GUI fields.",
-            bg="#1e1e1e", 
+            text="Note: Telegram Token should be set in .env file. Chat ID, Check Interval (5s) use defaults from settings.\nChrome browser will be visible (not headless). Console window shows detailed logs.\nTelegram sends a summary of check attempts every 5 minutes, and alerts as soon as a date is found. Stop button and /stop command close Chrome and end the process.\nToggle 'Use Telegram Inputs' to answer prompts in Telegram instead of GUI fields.",
+            bg=DARK_BG, 
             fg="#888888", 
             font=("Arial", 8, "italic"),
             justify="left"
@@ -149,12 +248,12 @@ class VisaBotGUI:
         """Enable/disable GUI inputs when Telegram inputs are used."""
         use_telegram = self.use_telegram_var.get()
         state = "disabled" if use_telegram else "normal"
+        # main() reads this flag; keep it in sync with the checkbox
+        os.environ["USE_TELEGRAM_INPUTS"] = "true" if use_telegram else "false"
 
         for widget in [
             self.email_entry,
             self.password_entry,
-            self.location_menu,
-            self.location_menu_2,
             self.earliest_date,
             self.latest_date,
             self.current_date,
@@ -163,20 +262,23 @@ class VisaBotGUI:
                 widget.configure(state=state)
             except Exception:
                 pass
+        # Location comboboxes go back to readonly, not editable "normal"
+        combo_state = "disabled" if use_telegram else "readonly"
+        self.location_menu.configure(state=combo_state)
+        self.location_menu_2.configure(state=combo_state)
         
     def build_controls(self) -> None:
         """Build control buttons (Start, Stop, Quit)."""
-        control_frame = tk.Frame(self.root, bg="#1e1e1e")
+        control_frame = tk.Frame(self.root, bg=DARK_BG)
         control_frame.grid(row=1, column=0, columnspan=4, pady=10)
         
         self.start_button = tk.Button(
             control_frame, 
             text="Start Bot", 
             command=self.start_bot,
-            width=18, 
             bg="#28a745", 
             fg="white",
-            font=("Arial", 10, "bold")
+            **_BUTTON_KW
         )
         self.start_button.grid(row=0, column=0, padx=10)
         
@@ -184,10 +286,9 @@ class VisaBotGUI:
             control_frame, 
             text="Stop Bot", 
             command=self.stop_bot,
-            width=18, 
             bg="#ffc107", 
             fg="black",
-            font=("Arial", 10, "bold"),
+            **_BUTTON_KW,
             state="disabled"
         )
         self.stop_button.grid(row=0, column=1, padx=10)
@@ -196,66 +297,86 @@ class VisaBotGUI:
             control_frame, 
             text="Quit", 
             command=self.confirm_quit,
-            width=18, 
             bg="#dc3545", 
             fg="white",
-            font=("Arial", 10, "bold")
+            **_BUTTON_KW
         )
         self.quit_button.grid(row=0, column=2, padx=10)
         
         self.status_label = tk.Label(
             control_frame, 
             text="Status: Idle", 
-            bg="#1e1e1e", 
+            bg=DARK_BG, 
             fg="#00bcd4",
-            font=("Arial", 10, "bold")
+            font=FONT_10_BOLD
         )
         self.status_label.grid(row=0, column=3, padx=20)
         
     def build_log_area(self) -> None:
         """Build log display area for bot output."""
-        log_frame = tk.Frame(self.root, bg="#1e1e1e")
+        log_frame = tk.Frame(self.root, bg=DARK_BG)
         log_frame.grid(row=2, column=0, columnspan=4, padx=10, pady=10, sticky="nsew")
         
         tk.Label(
             log_frame, 
             text="Bot Logs:", 
-            bg="#1e1e1e", 
-            fg="#ffffff",
-            font=("Arial", 10, "bold")
+            bg=DARK_BG, 
+            fg=LIGHT_FG,
+            font=FONT_10_BOLD
         ).pack(anchor="w")
         
         self.log_box = scrolledtext.ScrolledText(
             log_frame, 
             height=20, 
             width=100, 
-            state='disabled',
             bg="#121212", 
             fg="lime", 
             font=("Consolas", 9),
             wrap=tk.WORD
         )
         self.log_box.pack(fill=tk.BOTH, expand=True)
+        # Read-only without toggling state on every write: swallow typing and
+        # middle-click paste, but let Ctrl+C through to the Text copy binding
+        self.log_box.bind('<Key>', lambda e: 'break')
+        self.log_box.bind('<Control-c>', lambda e: None)
+        self.log_box.bind('<<PasteSelection>>', lambda e: 'break')
         
         # Configure grid weights for resizing
         self.root.grid_rowconfigure(2, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
         
     def log(self, message: str) -> None:
-        """Add message to log area.
+        """Queue message for the log area (safe to call from the bot thread).
         
         Args:
             message: Message text to display in the log area
         """
-        self.log_box.configure(state='normal')
-        self.log_box.insert(tk.END, message)
-        self.log_box.see(tk.END)
-        self.log_box.configure(state='disabled')
-        self.root.update_idletasks()
+        self._log_queue.put(message)
+        
+    def _drain_log(self) -> None:
+        """Write queued log messages to the log area in one batch."""
+        messages = []
+        for _ in range(LOG_DRAIN_MAX_ITEMS):
+            try:
+                messages.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if messages:
+            self.log_box.insert(tk.END, "".join(messages))
+            # Trim the oldest lines in one chunk so the Text widget stays small on long runs
+            if int(self.log_box.index('end-1c').split('.')[0]) > LOG_MAX_LINES:
+                self.log_box.delete('1.0', f'{LOG_TRIM_LINES + 1}.0')
+            self.log_box.see(tk.END)
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_log)
         
     def start_bot(self) -> None:
         """Start the bot in a separate thread."""
+        if self._future is not None and not self._future.done():
+            # A stopped run is still closing Chrome; a new run would queue behind it
+            messagebox.showinfo("Info", "The previous run is still stopping. Please wait.")
+            return
         use_telegram = self.use_telegram_var.get()
+        self._use_telegram = use_telegram  # Read by run_bot, which must not touch Tk variables
         if not use_telegram:
             # Validate inputs
             email = self.email_var.get().strip()
@@ -266,26 +387,17 @@ class VisaBotGUI:
                 return
             
             # Validate email format
-            if '@' not in email or '.' not in email.split('@')[1] if '@' in email else '':
+            if not EMAIL_RE.fullmatch(email):
                 messagebox.showerror("Input Error", "Please enter a valid email address.")
                 return
             
-            # Validate password length
-            if len(password) < 1:
-                messagebox.showerror("Input Error", "Password cannot be empty.")
-                return
-            
             # Get and validate date values
             try:
-                earliest = self.earliest_date.get_date().strftime("%Y-%m-%d")
-                latest = self.latest_date.get_date().strftime("%Y-%m-%d")
-                current = self.current_date.get_date().strftime("%Y-%m-%d")
+                earliest_date_obj = _parse_date_field(self.earliest_date.get())
+                latest_date_obj = _parse_date_field(self.latest_date.get())
+                current_date_obj = _parse_date_field(self.current_date.get())
                 
                 # Validate date logic
-                earliest_date_obj = datetime.strptime(earliest, "%Y-%m-%d")
-                latest_date_obj = datetime.strptime(latest, "%Y-%m-%d")
-                current_date_obj = datetime.strptime(current, "%Y-%m-%d")
-                
                 if earliest_date_obj > latest_date_obj:
                     messagebox.showerror("Date Error", "Earliest date must be before or equal to latest date.")
                     return
@@ -300,6 +412,17 @@ class VisaBotGUI:
             except Exception as e:
                 messagebox.showerror("Date Error", f"Error processing dates: {e}")
                 return
+            
+            # Keep the validated values so run_bot doesn't re-read the widgets
+            self._validated_inputs = {
+                'email': email,
+                'password': self.password_var.get(),
+                'location': self.location_var.get(),
+                'location2': self.location_var_2.get(),
+                'earliest_date': earliest_date_obj.isoformat(),
+                'latest_date': latest_date_obj.isoformat(),
+                'current_date': current_date_obj.isoformat(),
+            }
         
         # Update UI
         self.status_label.config(text="Status: Running", fg="#00ff00")
@@ -313,140 +436,104 @@ class VisaBotGUI:
         if use_telegram:
             self.log("Input Mode: Telegram\n")
         else:
-            self.log(f"Email: {self.email_var.get()}\n")
-            self.log(f"Location 1: {self.location_var.get()}\n")
-            if self.location_var_2.get().strip():
-                self.log(f"Location 2: {self.location_var_2.get()}\n")
-            self.log(f"Earliest Date: {earliest}\n")
-            self.log(f"Latest Date: {latest}\n")
-            self.log(f"Current Booking: {current}\n")
+            inputs = self._validated_inputs
+            self.log(f"Email: {inputs['email']}\n")
+            self.log(f"Location 1: {inputs['location']}\n")
+            if inputs['location2'].strip():
+                self.log(f"Location 2: {inputs['location2']}\n")
+            self.log(f"Earliest Date: {inputs['earliest_date']}\n")
+            self.log(f"Latest Date: {inputs['latest_date']}\n")
+            self.log(f"Current Booking: {inputs['current_date']}\n")
         self.log("="*60 + "\n\n")
         
-        # Start bot in separate thread
-        self.bot_thread = threading.Thread(target=self.run_bot, daemon=True)
-        self.bot_thread.start()
+        # Start bot on the worker thread
+        self._future = self._executor.submit(self.run_bot)
         
     def run_bot(self) -> None:
         """Run the bot with GUI inputs in a separate thread."""
         try:
-            # Import main function
-            from main import main as run_main
-            use_telegram = self.use_telegram_var.get()
-
-            if not use_telegram:
-                # Get inputs from GUI
-                email = self.email_var.get()
-                password = self.password_var.get()
-                location = self.location_var.get()
-                location_2 = self.location_var_2.get()
-                
-                # Validate date inputs
-                try:
-                    earliest_date = self.earliest_date.get_date().strftime("%Y-%m-%d")
-                    latest_date = self.latest_date.get_date().strftime("%Y-%m-%d")
-                    current_booking_date = self.current_date.get_date().strftime("%Y-%m-%d")
-                except Exception as e:
-                    self.log(f"[ERROR] Invalid date format: {e}\n")
-                    self.status_label.config(text="Status: Error", fg="#ff0000")
-                    self.start_button.config(state="normal")
-                    self.stop_button.config(state="disabled")
-                    self.is_running = False
-                    return
+            # Wait for the startup preload of main; import again only if it failed,
+            # so the import error is raised here and reported in the log
+            self._preload_thread.join()
+            run_main = self._run_main or __import__("main").main
+            use_telegram = self._use_telegram
             
             # Get values from defaults (which come from settings.py or .env)
-            telegram_token = DEFAULT_TELEGRAM_TOKEN
-            telegram_chat_id = DEFAULT_CHAT_ID
-            check_interval = DEFAULT_CHECK_INTERVAL
+            telegram_token = self._settings.telegram_bot_token
+            telegram_chat_id = self._settings.telegram_chat_id
+            check_interval = self._settings.check_interval
             
             # Validate that token is set
             if not telegram_token:
                 self.log("[ERROR] Telegram Bot Token not found. Please set TELEGRAM_BOT_TOKEN in .env file or settings.py\n")
-                self.status_label.config(text="Status: Error", fg="#ff0000")
-                self.start_button.config(state="normal")
-                self.stop_button.config(state="disabled")
+                self._ui(lambda: self._show_idle("Status: Error", "#ff0000"))
                 self.is_running = False
                 return
             
             gui_inputs: Optional[Dict[str, Any]] = None
             if not use_telegram:
-                # Prepare inputs dictionary for main()
-                gui_inputs = {
-                    'email': email,
-                    'password': password,
-                    'telegram_token': telegram_token,
-                    'telegram_chat_id': telegram_chat_id,
-                    'location': location,
-                    'location2': location_2,
-                    'earliest_date': earliest_date,
-                    'latest_date': latest_date,
-                    'current_date': current_booking_date,
-                    'check_interval': check_interval
-                }
+                # Prepare inputs dictionary for main() from the values validated in start_bot
+                gui_inputs = dict(
+                    self._validated_inputs,
+                    telegram_token=telegram_token,
+                    telegram_chat_id=telegram_chat_id,
+                    check_interval=check_interval
+                )
             
             self.log(f"[INFO] Initializing bot with GUI inputs...\n")
             
-            # Redirect stdout and stderr to log
-            class LogWriter:
-                def __init__(self, log_callback):
-                    self.log_callback = log_callback
-                    self.buffer = ""
-                    
-                def write(self, text: str) -> None:
-                    if text.strip():
-                        # Clean up log formatting for GUI display
-                        text_clean = text.strip()
-                        if text_clean:
-                            self.log_callback(text_clean + "\n")
-                            
-                def flush(self) -> None:
-                    pass
-            
-            # Redirect stdout and stderr
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
-            sys.stdout = LogWriter(self.log)
-            sys.stderr = LogWriter(self.log)
+            # Logging records go to the GUI through a handler on the root logger;
+            # print() output from main is captured by a _LogWriter that feeds the same queue
+            log_handler = _QueueLogHandler(self._log_queue)
+            root_logger = logging.getLogger()
+            root_logger.addHandler(log_handler)
+            stdout_writer = _LogWriter(self._log_queue)
+            stderr_writer = _LogWriter(self._log_queue)
             
             try:
                 # Check if stop was requested before starting
                 if self.stop_event.is_set():
                     return
                     
-                # Toggle Telegram inputs if requested
-                if use_telegram:
-                    os.environ["USE_TELEGRAM_INPUTS"] = "true"
-                else:
-                    os.environ["USE_TELEGRAM_INPUTS"] = "false"
-
                 # Run main with GUI inputs and pass stop_event for proper stopping
                 # This will skip the interactive prompts and allow proper stopping
-                run_main(gui_inputs=gui_inputs, stop_event=self.stop_event)
+                with contextlib.redirect_stdout(stdout_writer), contextlib.redirect_stderr(stderr_writer):
+                    run_main(gui_inputs=gui_inputs, stop_event=self.stop_event,
+                             on_browser_start=self._set_browser_pid)
             except KeyboardInterrupt:
                 self.log("[INFO] Bot interrupted by user\n")
             except Exception as e:
                 self.log(f"[ERROR] Bot error: {e}\n")
-                import traceback
-                self.log(traceback.format_exc())
+                # Stream the traceback through the stderr writer (flushed below)
+                traceback.print_exc(file=stderr_writer)
             finally:
-                # Restore stdout/stderr
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-                self.status_label.config(text="Status: Stopped", fg="#ffaa00")
-                self.start_button.config(state="normal")
-                self.stop_button.config(state="disabled")
+                # Emit any partial line and detach the GUI log handler
+                stdout_writer.flush()
+                stderr_writer.flush()
+                root_logger.removeHandler(log_handler)
+                self._ui(lambda: self._show_idle("Status: Stopped", "#ffaa00"))
                 self.is_running = False
                 self.stop_event.clear()  # Reset stop event for next run
                 
         except Exception as e:
             self.log(f"[ERROR] Fatal error: {e}\n")
-            import traceback
-            self.log(traceback.format_exc())
-            self.status_label.config(text="Status: Error", fg="#ff0000")
-            self.start_button.config(state="normal")
-            self.stop_button.config(state="disabled")
+            err_writer = _LogWriter(self._log_queue)
+            traceback.print_exc(file=err_writer)
+            err_writer.flush()
+            self._ui(lambda: self._show_idle("Status: Error", "#ff0000"))
             self.is_running = False
             self.stop_event.clear()
             
+    def _ui(self, fn) -> None:
+        """Run fn on the Tk main loop (widgets must not be touched from the bot thread)."""
+        self.root.after(0, fn)
+        
+    def _show_idle(self, status: str, color: str) -> None:
+        """Show a final status and re-enable Start once the bot thread is done."""
+        self.status_label.config(text=status, fg=color)
+        self.start_button.config(state="normal")
+        self.stop_button.config(state="disabled")
+        
     def stop_bot(self) -> None:
         """Stop the bot by setting the stop event and forcing cleanup."""
         if self.is_running:
@@ -455,31 +542,49 @@ class VisaBotGUI:
             self.log("[INFO] Stopping bot and closing Chrome...\n")
             self.status_label.config(text="Status: Stopping...", fg="#ffaa00")
             
-            # Force cleanup - try to close Chrome processes if needed
-            try:
-                import subprocess
-                # Kill Chrome processes related to automation (chromedriver)
-                subprocess.run(["taskkill", "/F", "/IM", "chromedriver.exe"], 
-                             capture_output=True, shell=True)
-                subprocess.run(["taskkill", "/F", "/IM", "chrome.exe"], 
-                             capture_output=True, shell=True)
-            except Exception as e:
-                self.log(f"[WARNING] Could not force close Chrome: {e}\n")
+            # Force cleanup off the UI thread - waiting for Chrome to exit can take a few seconds
+            threading.Thread(target=self._force_kill_chrome, daemon=True).start()
         else:
             messagebox.showinfo("Info", "Bot is not running.")
             
+    def _set_browser_pid(self, pid: int) -> None:
+        """Remember the chromedriver PID of the current browser (called from the bot thread)."""
+        self._browser_pid = pid
+        
+    def _force_kill_chrome(self) -> None:
+        """Kill the bot's chromedriver and the Chrome it launched (runs on a helper thread)."""
+        pid, self._browser_pid = self._browser_pid, None
+        if pid is None:
+            return
+        try:
+            # Only the bot's own process tree; other Chrome windows are left alone
+            from visa_scraper import terminate_process_tree
+            terminate_process_tree(pid)
+        except Exception as e:
+            # log() only enqueues, so it is safe to call from this thread
+            self.log(f"[WARNING] Could not force close Chrome: {e}\n")
+            
     def confirm_quit(self) -> None:
         """Confirm before quitting the application."""
         if self.is_running:
             if messagebox.askyesno("Quit", "Bot is running. Stop and quit?"):
                 self.stop_bot()
-                self.root.after(1000, self.root.destroy)
+                self.root.after(1000, self._quit)
         else:
             if messagebox.askokcancel("Quit", "Are you sure you want to quit?"):
-                self.root.destroy()
+                self._quit()
+                
+    def _quit(self) -> None:
+        """Release the worker thread and close the window."""
+        # The stop event is already set, so a running bot winds down on its own
+        self._executor.shutdown(wait=False)
+        self.root.destroy()
 
 
 if __name__ == "__main__":
+    if any(arg in ("-h", "--help") for arg in sys.argv[1:]):
+        print(USAGE)
+        sys.exit(0)
     root = tk.Tk()
     app = VisaBotGUI(root)
     root.mainloop()
@@ -1,35 +1,137 @@
 #!/usr/bin/env python3
 """Main script for US Visa Appointment Automation Bot."""
+import atexit
+import json
 import logging
+import queue
 import time
 import sys
 from datetime import datetime, date
-from typing import Optional, Dict, Any
-from settings import (
-    LOGIN_URL, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID,
-    EARLIEST_ACCEPTABLE_DATE, LATEST_ACCEPTABLE_DATE, CURRENT_BOOKING_DATE,
-    USER_CONSULATE, USER_CONSULATE_2, CONSULATES, CHECK_INTERVAL, SHOW_GUI
-)
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List
+from settings import CONSULATES, CONSULATE_NAMES, STATE_FILE, get_settings, load_state, parse_date, EMAIL_RE
 import os
 import threading
-from visa_scraper import VisaScraper
-from telegram_bot import TelegramNotifier
-from selenium.webdriver.common.by import By
-from telegram_inputs import get_inputs_via_telegram
+from bisect import bisect_left
+from collections import deque
+
+# Adaptive polling: back off on throttling/slow checks, ease back toward check_interval otherwise
+MAX_BACKOFF_SECONDS = 600
+SLOW_CHECK_SECONDS = 20  # Mean check latency above this is treated as site load
+# Reload the page every SESSION_REFRESH_SECONDS; relaunch the browser and log in again only if
+# that reload shows a stale session, or once the session is FULL_RESTART_SECONDS old
+# (time-based, so the cadence doesn't depend on how fast a check is)
+SESSION_REFRESH_SECONDS = 300
+FULL_RESTART_SECONDS = 1200
+# Circuit breaker: after BREAKER_TRIP_FAILURES failed checks in a row, pause for BREAKER_OPEN_SECONDS
+BREAKER_TRIP_FAILURES = 5
+BREAKER_OPEN_SECONDS = 300
+# Cap on waiting for queued Telegram messages when exiting because the site is busy
+BUSY_EXIT_DRAIN_SECONDS = 3.0
+
+# Numbered consulate menu for get_user_inputs(), printed with a single write
+_CONSULATES_MENU = "\n".join(f"   {i}. {loc}" for i, loc in enumerate(CONSULATE_NAMES, 1))
 
 # Configure logging with UTF-8 encoding to handle emojis
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('visa_bot.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Callers only enqueue records; a background listener does the file/console writes
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_file_handler = logging.FileHandler('visa_bot.log', encoding='utf-8')
+_log_file_handler.setFormatter(_log_formatter)
+_log_stream_handler = logging.StreamHandler(sys.stdout)
+_log_stream_handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, _log_file_handler, _log_stream_handler)
+_log_queue_handler = QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Full format is applied by the listener
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes queued records on exit
 
 logger = logging.getLogger(__name__)
 
 
+def next_poll_delay(poll_delay: float, check_interval: float, busy: bool, mean_latency: float) -> float:
+    """Adapt the delay between checks: double on throttling, grow on slow checks, else ease back.
+    
+    Args:
+        poll_delay: Current delay in seconds
+        check_interval: Configured interval; the delay never drops below it
+        busy: Whether the last check hit throttling (HTTP 429/503 or "system busy")
+        mean_latency: Mean duration of recent checks in seconds
+        
+    Returns:
+        Delay before the next check, at most MAX_BACKOFF_SECONDS
+    """
+    if busy:
+        poll_delay = min(poll_delay * 2, MAX_BACKOFF_SECONDS)
+        logger.warning("Site is throttling/busy - backing off to %.0fs between checks", poll_delay)
+    elif mean_latency > SLOW_CHECK_SECONDS:
+        poll_delay = min(poll_delay * 1.5, MAX_BACKOFF_SECONDS)
+        logger.info("Checks are slow - polling every %.0fs", poll_delay)
+    else:
+        poll_delay = max(check_interval, poll_delay * 0.9)
+    return poll_delay
+
+
+class SystemBusy(Exception):
+    """Raised when the visa site reports "system is busy" right after location selection."""
+
+
+class CircuitBreaker:
+    """Fail-fast guard for the monitoring loop.
+    
+    Opens after trip_threshold consecutive failures; while open no checks are run. Once
+    open_duration has passed it lets a single probe through (half-open): success closes it,
+    failure opens it again for another open_duration.
+    """
+
+    def __init__(self, trip_threshold: int = BREAKER_TRIP_FAILURES, open_duration: float = BREAKER_OPEN_SECONDS):
+        self.trip_threshold = trip_threshold
+        self.open_duration = open_duration
+        self.failures = 0
+        self.state = "closed"  # "closed", "open" or "half_open"
+        self.opened_at = 0.0
+
+    def cooldown_remaining(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 when not open)."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.open_duration - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        """True if a check may run now; moves an expired open breaker to half-open."""
+        if self.state == "open":
+            if self.cooldown_remaining() > 0:
+                return False
+            self.state = "half_open"
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.state = "closed"
+
+    def record_failure(self) -> bool:
+        """Count a failed check. Returns True if this failure opened the breaker."""
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.trip_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+
+@lru_cache(maxsize=64)
+def _parse_ymd(date_str: str) -> date:
+    """Parse a YYYY-MM-DD string (cached: polls keep seeing the same dates).
+    
+    Raises:
+        ValueError: If the string is not a valid YYYY-MM-DD date
+    """
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
 def get_user_inputs() -> Dict[str, Any]:
     """Get user inputs interactively before starting the bot.
     
@@ -49,7 +151,7 @@ def get_user_inputs() -> Dict[str, Any]:
     while True:
         try:
             email = input("1. Enter your visa account email: ").strip()
-            if email and '@' in email and '.' in email.split('@')[1]:
+            if EMAIL_RE.fullmatch(email):
                 inputs['email'] = email
                 break
             print("   ❌ Invalid email format. Please try again.")
@@ -74,50 +176,54 @@ def get_user_inputs() -> Dict[str, Any]:
     inputs['telegram_chat_id'] = chat_id if chat_id else '2023815877'
     
     # 4. Location/Consulate
+    # Prompts and range message are the same for both location questions; build them once
+    n_consulates = len(CONSULATE_NAMES)
+    location_prompt = f"   Enter choice (1-{n_consulates}) [default: Toronto]: "
+    location2_prompt = f"   Enter choice (1-{n_consulates}) or press Enter to skip: "
+    out_of_range_msg = f"   ❌ Please enter a number between 1 and {n_consulates}"
+
     print("\n4. Select consulate location (Location 1):")
-    consulates_list = list(CONSULATES.keys())
-    for i, loc in enumerate(consulates_list, 1):
-        print(f"   {i}. {loc}")
+    print(_CONSULATES_MENU)
     
     while True:
         try:
-            choice = input(f"   Enter choice (1-{len(consulates_list)}) [default: Toronto]: ").strip()
+            choice = input(location_prompt).strip()
             if not choice:
                 inputs['location'] = 'Toronto'
                 break
             choice_num = int(choice)
-            if 1 <= choice_num <= len(consulates_list):
-                inputs['location'] = consulates_list[choice_num - 1]
+            if 1 <= choice_num <= n_consulates:
+                inputs['location'] = CONSULATE_NAMES[choice_num - 1]
                 break
-            print(f"   ❌ Please enter a number between 1 and {len(consulates_list)}")
+            print(out_of_range_msg)
         except ValueError:
             print("   ❌ Invalid input. Please enter a number.")
     
     # 5. Optional second location
     print("\n5. Select second consulate location (optional):")
-    for i, loc in enumerate(consulates_list, 1):
-        print(f"   {i}. {loc}")
+    print(_CONSULATES_MENU)
     while True:
         try:
-            choice = input(f"   Enter choice (1-{len(consulates_list)}) or press Enter to skip: ").strip()
+            choice = input(location2_prompt).strip()
             if not choice:
                 inputs['location2'] = ''
                 break
             choice_num = int(choice)
-            if 1 <= choice_num <= len(consulates_list):
-                inputs['location2'] = consulates_list[choice_num - 1]
+            if 1 <= choice_num <= n_consulates:
+                inputs['location2'] = CONSULATE_NAMES[choice_num - 1]
                 break
-            print(f"   ❌ Please enter a number between 1 and {len(consulates_list)}")
+            print(out_of_range_msg)
         except ValueError:
             print("   ❌ Invalid input. Please enter a number.")
 
     # Set fixed values (not prompted)
     # Get from settings or environment variables (not hardcoded for security)
-    inputs['telegram_token'] = TELEGRAM_BOT_TOKEN if TELEGRAM_BOT_TOKEN else os.getenv('TELEGRAM_BOT_TOKEN', '')
-    inputs['earliest_date'] = EARLIEST_ACCEPTABLE_DATE
-    inputs['latest_date'] = LATEST_ACCEPTABLE_DATE
-    inputs['current_date'] = CURRENT_BOOKING_DATE
-    inputs['check_interval'] = CHECK_INTERVAL
+    settings = get_settings()
+    inputs['telegram_token'] = settings.telegram_bot_token
+    inputs['earliest_date'] = settings.earliest_acceptable_date
+    inputs['latest_date'] = settings.latest_acceptable_date
+    inputs['current_date'] = settings.current_booking_date
+    inputs['check_interval'] = settings.check_interval
     
     print("\n" + "="*60)
     print("Configuration Summary:")
@@ -143,8 +249,62 @@ def get_user_inputs() -> Dict[str, Any]:
     return inputs
 
 
+def load_config_inputs(path: str) -> Dict[str, Any]:
+    """Load bot inputs from a JSON config file instead of prompting for them.
+    
+    Args:
+        path: Path to a JSON object with email and password, plus optional location,
+              location2, telegram_chat_id, earliest_date, latest_date, current_date
+              and check_interval (missing values come from settings / .env)
+    
+    Returns:
+        Dictionary with the same keys as get_user_inputs()
+        
+    Raises:
+        IOError: If the file cannot be read
+        ValueError: If the file is not valid JSON or a value is missing or invalid
+    """
+    with open(path, "r", encoding='utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"Config file {path} must contain a JSON object")
+    settings = get_settings()
+    
+    inputs = {
+        'email': str(config.get('email', '')).strip(),
+        'password': str(config.get('password', '')),
+        'telegram_token': settings.telegram_bot_token,
+        'telegram_chat_id': str(config.get('telegram_chat_id', settings.telegram_chat_id)),
+        'location': config.get('location', settings.user_consulate),
+        'location2': config.get('location2', settings.user_consulate_2) or '',
+        'earliest_date': config.get('earliest_date', settings.earliest_acceptable_date),
+        'latest_date': config.get('latest_date', settings.latest_acceptable_date),
+        'current_date': config.get('current_date', settings.current_booking_date),
+        'check_interval': config.get('check_interval', settings.check_interval),
+    }
+    
+    # Validate once up front so a bad config fails before the browser starts
+    if not EMAIL_RE.fullmatch(inputs['email']) or not inputs['password']:
+        raise ValueError(f"Config file {path} must set a valid email and a password")
+    for key in ('location', 'location2'):
+        if inputs[key] and inputs[key] not in CONSULATES:
+            raise ValueError(f"Invalid {key}: {inputs[key]}. Choose from: {', '.join(CONSULATES)}")
+    for key in ('earliest_date', 'latest_date', 'current_date'):
+        try:
+            inputs[key] = parse_date(inputs[key]).isoformat()
+        except ValueError:
+            raise ValueError(f"Invalid {key}: {inputs[key]}. Expected YYYY-MM-DD") from None
+    if not isinstance(inputs['check_interval'], int) or inputs['check_interval'] <= 0:
+        raise ValueError(f"Invalid check_interval: {inputs['check_interval']}. Must be a positive integer")
+    
+    return inputs
+
+
 def update_settings_dates(new_date_str: str) -> None:
-    """Update CURRENT_BOOKING_DATE and LATEST_ACCEPTABLE_DATE in settings.py after successful booking.
+    """Save the new booking date as CURRENT_BOOKING_DATE and LATEST_ACCEPTABLE_DATE after a successful booking.
+    
+    The dates are stored in settings.STATE_FILE (JSON), which settings.py reads at startup.
+    The file is replaced atomically, so a crash mid-write never leaves it truncated.
     
     Args:
         new_date_str: New booking date in YYYY-MM-DD format
@@ -155,45 +315,52 @@ def update_settings_dates(new_date_str: str) -> None:
     """
     # Validate date format
     try:
-        datetime.strptime(new_date_str, "%Y-%m-%d")
+        _parse_ymd(new_date_str)
     except ValueError:
-        logger.error(f"[ERROR] Invalid date format: {new_date_str}. Expected YYYY-MM-DD")
+        logger.error("[ERROR] Invalid date format: %s. Expected YYYY-MM-DD", new_date_str)
         raise ValueError(f"Invalid date format: {new_date_str}. Expected YYYY-MM-DD")
     
     try:
-        # Read current settings
-        with open("settings.py", "r", encoding='utf-8') as f:
-            lines = f.readlines()
-
-        # Write updated settings
-        with open("settings.py", "w", encoding='utf-8') as f:
-            for line in lines:
-                if line.strip().startswith("CURRENT_BOOKING_DATE"):
-                    f.write(f'CURRENT_BOOKING_DATE = os.getenv(\'CURRENT_BOOKING_DATE\', \'{new_date_str}\')\n')
-                elif line.strip().startswith("LATEST_ACCEPTABLE_DATE"):
-                    f.write(f'LATEST_ACCEPTABLE_DATE = os.getenv(\'LATEST_ACCEPTABLE_DATE\', \'{new_date_str}\')\n')
-                else:
-                    f.write(line)
+        state = load_state()
+        state['current_booking_date'] = new_date_str
+        state['latest_acceptable_date'] = new_date_str
 
-        logger.info(f"[INFO] settings.py updated with new booking date: {new_date_str}")
+        # Serialize in memory, write the temp file in one call, then rename over the old state
+        tmp_path = Path(STATE_FILE + '.tmp')
+        tmp_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
+        os.replace(tmp_path, STATE_FILE)
+
+        logger.info("[INFO] Booking state updated with new booking date: %s", new_date_str)
     except IOError as e:
-        logger.error(f"[ERROR] Failed to update settings.py: {e}")
+        logger.error("[ERROR] Failed to update %s: %s", STATE_FILE, e)
         raise
     except Exception as e:
-        logger.error(f"[ERROR] Unexpected error updating settings.py: {e}")
+        logger.error("[ERROR] Unexpected error updating %s: %s", STATE_FILE, e)
         raise
 
 
-def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threading.Event] = None) -> None:
+def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threading.Event] = None,
+         on_browser_start: Optional[Callable[[int], None]] = None, config_path: Optional[str] = None) -> None:
     """Main function to run the US Visa Appointment Bot.
     
     Args:
         gui_inputs: Optional dictionary of inputs from GUI. If provided, skips interactive prompts.
                    Expected keys: email, password, telegram_token, telegram_chat_id, location,
                    earliest_date, latest_date, current_date, check_interval
+                   (optional: stop_event, used when the stop_event argument is not given)
         stop_event: Optional threading.Event to signal when to stop the bot
+        on_browser_start: Optional callback receiving the chromedriver PID each time a browser is started
+        config_path: Optional JSON config file (see load_config_inputs); skips the interactive prompts
     """
+    # Deferred so `--help` and the interactive prompts don't pay for Selenium/python-telegram-bot imports
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.support import expected_conditions as EC
+    from telegram_bot import TelegramNotifier
+    from telegram_inputs import get_inputs_via_telegram
+    from visa_scraper import APPT_DATE_LOCATOR, VisaScraper, terminate_process_tree
+
     logger.info("Starting US Visa Appointment Bot")
+    settings = get_settings()
     
     # Initialize components
     telegram_bot = None
@@ -201,32 +368,39 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
 
     # Ensure stop_event exists for CLI runs too
     if stop_event is None:
-        stop_event = threading.Event()
+        stop_event = (gui_inputs or {}).get('stop_event') or threading.Event()
 
     use_telegram_inputs = (os.getenv("USE_TELEGRAM_INPUTS", "false").lower() == "true") and not gui_inputs
+    drain_timeout = 30.0  # Default drain; the system-busy exit shortens it
     
     try:
         # Initialize Telegram bot (needed for inputs and notifications)
         logger.info("Initializing Telegram bot...")
+        def close_browser_on_stop(stopping_scraper) -> None:
+            # Capture the chromedriver PID before quit() drops the driver
+            browser_pid = stopping_scraper.driver_pid
+            try:
+                stopping_scraper.close()
+            except Exception as e:
+                logger.warning("Error closing browser on stop: %s", e)
+            # Force-kill whatever is left of the bot's own chromedriver/Chrome tree (other Chrome windows are untouched)
+            if browser_pid:
+                try:
+                    terminate_process_tree(browser_pid)
+                except Exception as e:
+                    logger.warning("Error force-killing Chrome processes: %s", e)
+
         def telegram_stop_callback() -> None:
             # Signal stop and close browser to interrupt any waits
             stop_event.set()
-            try:
-                if scraper:
-                    scraper.close()
-            except Exception as e:
-                logger.warning(f"Error closing browser on stop: {e}")
-            # Force-kill Chrome/Chromedriver to ensure full stop
-            try:
-                import subprocess
-                subprocess.run(["taskkill", "/F", "/IM", "chromedriver.exe"], capture_output=True, shell=True)
-                subprocess.run(["taskkill", "/F", "/IM", "chrome.exe"], capture_output=True, shell=True)
-            except Exception as e:
-                logger.warning(f"Error force-killing Chrome processes: {e}")
+            if scraper:
+                # Runs on the Telegram event loop: quitting the browser and waiting for its
+                # processes to exit would block every other handler, so do it on a helper thread
+                threading.Thread(target=close_browser_on_stop, args=(scraper,), daemon=True).start()
 
         if use_telegram_inputs:
-            telegram_token = TELEGRAM_BOT_TOKEN or os.getenv("TELEGRAM_BOT_TOKEN", "")
-            telegram_chat_id = TELEGRAM_CHAT_ID or os.getenv("TELEGRAM_CHAT_ID", "0")
+            telegram_token = settings.telegram_bot_token
+            telegram_chat_id = settings.telegram_chat_id or "0"
             if not telegram_token:
                 logger.error("Telegram bot token not set. Please set TELEGRAM_BOT_TOKEN in .env")
                 sys.exit(1)
@@ -235,6 +409,9 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
             if gui_inputs:
                 user_inputs = gui_inputs
                 logger.info("Using inputs from GUI")
+            elif config_path:
+                user_inputs = load_config_inputs(config_path)
+                logger.info("Using inputs from config file %s", config_path)
             else:
                 user_inputs = get_user_inputs()
             telegram_token = user_inputs['telegram_token']
@@ -250,31 +427,28 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
             print("\n⚠️  TELEGRAM_CHAT_ID not found!")
             print("Please send a message to your Telegram bot (e.g., /start)")
             print("The chat ID will be automatically detected...\n")
-            # Wait up to 60 seconds for a message
-            for i in range(60):
-                time.sleep(1)
-                if telegram_bot.chat_id and telegram_bot.chat_id != '0':
-                    logger.info(f"Chat ID detected: {telegram_bot.chat_id}")
-                    break
-            if not telegram_bot.chat_id or telegram_bot.chat_id == '0':
+            # Wait up to 60 seconds for a message; returns as soon as the handler sees one
+            if telegram_bot.chat_id_event.wait(60):
+                logger.info("Chat ID detected: %s", telegram_bot.chat_id)
+            else:
                 logger.error("Chat ID not detected. Please send a message to your bot and try again.")
                 print("\n❌ Chat ID not detected. Please send a message to your bot and try again.")
                 sys.exit(1)
         
-        telegram_bot.send_sync("🤖 US Visa Appointment Bot started!")
+        telegram_bot.send_async("🤖 US Visa Appointment Bot started!")
         logger.info("Telegram bot initialized")
 
         # If using Telegram inputs, ask for all configuration now
         if use_telegram_inputs:
-            defaults = {
-                "location": USER_CONSULATE,
-                "location2": USER_CONSULATE_2,
-                "earliest_date": EARLIEST_ACCEPTABLE_DATE,
-                "latest_date": LATEST_ACCEPTABLE_DATE,
-                "current_date": CURRENT_BOOKING_DATE,
-                "check_interval": CHECK_INTERVAL,
-            }
-            user_inputs = get_inputs_via_telegram(telegram_bot, defaults)
+            # Settings-derived defaults offered for each prompt
+            user_inputs = get_inputs_via_telegram(telegram_bot, {
+                "location": settings.user_consulate,
+                "location2": settings.user_consulate_2,
+                "earliest_date": settings.earliest_acceptable_date,
+                "latest_date": settings.latest_acceptable_date,
+                "current_date": settings.current_booking_date,
+                "check_interval": settings.check_interval,
+            })
             user_inputs["telegram_token"] = telegram_token
             user_inputs["telegram_chat_id"] = telegram_bot.chat_id
 
@@ -291,9 +465,10 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
         check_interval = user_inputs['check_interval']
         
         # Parse date ranges from user inputs
-        earliest_date_obj = datetime.strptime(earliest_date, "%Y-%m-%d").date()
-        latest_date_obj = datetime.strptime(latest_date, "%Y-%m-%d").date()
-        current_booking = datetime.strptime(current_booking_date, "%Y-%m-%d").date()
+        # (as day ordinals, so the per-check range tests are plain int compares)
+        earliest_ord = _parse_ymd(earliest_date).toordinal()
+        latest_ord = _parse_ymd(latest_date).toordinal()
+        current_ord = _parse_ymd(current_booking_date).toordinal()
 
         # Use latest_date from user input as max_date
         max_date = latest_date
@@ -302,6 +477,10 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
         locations = [location]
         if location2 and location2.strip().lower() != location.lower():
             locations.append(location2.strip())
+        # Facility id per location, resolved once for the JSON days endpoint
+        # (locations without a known id get None and are skipped in the request)
+        location_facilities = [(loc, CONSULATES.get(loc)) for loc in locations]
+        facility_ids = [fid for _, fid in location_facilities if fid is not None]
 
         def restart_session() -> VisaScraper:
             nonlocal scraper
@@ -314,33 +493,34 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
             scraper = VisaScraper(
                 email=email,
                 password=password,
-                url=LOGIN_URL,
-                headless=not SHOW_GUI,
-                browser_type='chrome'
+                url=settings.login_url,
+                headless=not settings.show_gui,
+                browser_type='chrome',
+                on_driver_start=on_browser_start
             )
 
             # Login
             logger.info("Logging in to visa website...")
             if not scraper.login():
                 logger.error("Failed to login")
-                telegram_bot.send_sync("❌ Failed to login to visa website. Please check credentials.")
+                telegram_bot.send_async("❌ Failed to login to visa website. Please check credentials.")
                 sys.exit(1)
 
             logger.info("Login successful")
-            telegram_bot.send_sync("✅ Successfully logged in to visa website!")
+            telegram_bot.send_async("✅ Successfully logged in to visa website!")
 
             # Click Continue button (goes to Groups page)
             logger.info("Clicking Continue button...")
             if not scraper.click_continue():
                 logger.error("Failed to click Continue")
-                telegram_bot.send_sync("❌ Failed to click Continue. Exiting.")
+                telegram_bot.send_async("❌ Failed to click Continue. Exiting.")
                 sys.exit(1)
 
             # Extract existing appointment date from Groups page (optional)
             logger.info("Extracting existing appointment date from Groups page...")
             existing_date = scraper.get_existing_appointment_date()
             if existing_date:
-                logger.info(f"Found existing appointment date: {existing_date}")
+                logger.info("Found existing appointment date: %s", existing_date)
 
             # Set max_date in scraper
             scraper.set_max_date(max_date)
@@ -349,15 +529,15 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
             logger.info("Navigating to Reschedule Appointment...")
             if not scraper.navigate_to_reschedule():
                 logger.error("Failed to navigate to reschedule")
-                telegram_bot.send_sync("❌ Failed to navigate to reschedule. Exiting.")
+                telegram_bot.send_async("❌ Failed to navigate to reschedule. Exiting.")
                 sys.exit(1)
 
             # Get location selection from user input
             selected_location = locations[0]
-            logger.info(f"Selecting location: {selected_location}")
+            logger.info("Selecting location: %s", selected_location)
             if not scraper.select_location(selected_location):
                 logger.error("Failed to select location")
-                telegram_bot.send_sync("❌ Failed to select location. Exiting.")
+                telegram_bot.send_async("❌ Failed to select location. Exiting.")
                 sys.exit(1)
 
             # After selecting location, immediately check if calendar can be opened
@@ -370,19 +550,18 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
                 logger.warning("Calendar failed to open right after location selection")
                 # Only check for system busy if calendar fails to open
                 if scraper.check_system_busy_error():
-                    logger.error("System is busy. Please try again later.")
-                    telegram_bot.send_sync("⚠️ <b>System is busy</b>\n\nPlease try again.")
-                    logger.info("Exiting due to system busy error")
-                    sys.exit(0)
+                    raise SystemBusy("System is busy. Please try again later.")
                 else:
                     logger.warning("Calendar failed to open but no system busy error detected. Will retry from home...")
             else:
                 logger.info("Calendar opened successfully after location selection - system is ready")
                 # Close the calendar for now, will reopen when checking dates
                 try:
-                    scraper.driver.find_element(By.ID, "appointments_consulate_appointment_date").click()
-                except:
-                    pass
+                    scraper._wait(5).until(
+                        EC.element_to_be_clickable(APPT_DATE_LOCATOR)
+                    ).click()
+                except WebDriverException as e:
+                    logger.debug("Could not close the calendar after the readiness check: %s", e)
 
             scraper.selected_counselor = selected_location
             scraper.counselor_selected = True
@@ -394,7 +573,7 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
         
         selected_location = locations[0]
         locations_label = ", ".join(locations)
-        telegram_bot.send_sync(
+        telegram_bot.send_async(
             f"✅ Monitoring appointments\n"
             f"📍 Locations: {locations_label}\n"
             f"📅 Date range: {earliest_date} to {latest_date}\n"
@@ -404,135 +583,204 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
         
         
         
-        logger.info(f"Monitoring for locations: {locations}, max date: {max_date}")
-        logger.info(f"Will only book if date is earlier than: {current_booking_date}")
+        logger.info("Monitoring for locations: %s, max date: %s", locations, max_date)
+        logger.info("Will only book if date is earlier than: %s", current_booking_date)
         
         # Main monitoring loop
-        logger.info(f"Starting monitoring loop (checking every {check_interval} seconds)")
+        logger.info("Starting monitoring loop (checking every %s seconds)", check_interval)
         check_count = 0
         location_index = 0
         
-        # First check immediately (no wait) - subsequent checks will wait after retry
+        # First check immediately (no wait) - subsequent checks wait poll_delay. A check with no
+        # bookable date is a single JSON fetch, so without this wait the loop would poll the
+        # portal back-to-back.
         first_check = True
+        poll_delay = check_interval  # Adapted after every check, never below check_interval
+        session_started = last_refresh = time.monotonic()
+        check_latencies = deque(maxlen=10)
+        # Informational messages for the current check, sent as one Telegram message when it ends
+        cycle_events: List[str] = []
+
+        def flush_cycle_events(force_status: bool = False) -> None:
+            # Attempt summaries use the same send queue, so they stay in order with the events
+            telegram_bot.flush_status(force_status)
+            if cycle_events:
+                logger.debug("Check #%d events: %s", check_count, " | ".join(cycle_events))
+                telegram_bot.send_async("\n\n".join(cycle_events))
+                cycle_events.clear()
+
+        breaker = CircuitBreaker()
+
+        def record_check_failure() -> None:
+            if breaker.record_failure():
+                logger.warning("%d failed checks in a row - pausing checks for %ds", breaker.failures, breaker.open_duration)
+                cycle_events.append(
+                    f"⏸️ <b>Pausing checks</b>\n\n"
+                    f"{breaker.failures} failed checks in a row. Trying again in {breaker.open_duration / 60:.0f} minutes..."
+                )
+
+        def advance_location() -> None:
+            """Rotate to the next configured location in place (no home navigation)."""
+            nonlocal location_index, selected_location
+            if len(locations) < 2:
+                logger.debug("Only one location configured - retrying same location")
+                return
+            location_index = (location_index + 1) % len(locations)
+            next_location = locations[location_index]
+            try:
+                if scraper.cycle_location(next_location, [selected_location]):
+                    selected_location = next_location
+                    logger.debug("Location switched to %s - retrying", next_location)
+                else:
+                    logger.warning("Location switch failed - will retry in next cycle")
+            except Exception as e:
+                logger.error("Error during consulate cycle: %s", e, exc_info=True)
         
         while True:
-            # Check if stop was requested
-            if stop_event and stop_event.is_set():
+            # Pace checks without blocking stop: wait() returns True as soon as stop is set
+            # (a zero timeout on the first check just tests the flag)
+            # (an open circuit breaker stretches the wait to the end of its cooldown)
+            if stop_event.wait(0 if first_check else max(poll_delay, breaker.cooldown_remaining())):
                 logger.info("Stop signal received. Stopping bot...")
-                telegram_bot.send_sync("🛑 Bot stopped by user")
+                telegram_bot.send_async("🛑 Bot stopped by user")
                 break
+            first_check = False
+            if not breaker.allow():
+                continue
                 
             try:
                 check_count += 1
 
-                # Restart session every 50 attempts
-                if check_count >= 50:
-                    telegram_bot.send_sync(
+                # Keep the session warm with a page reload; restart it only when stale or overdue
+                restart_reason = None
+                now = time.monotonic()
+                if now - session_started >= FULL_RESTART_SECONDS:
+                    restart_reason = f"Session is {(now - session_started) / 60:.0f} minutes old"
+                elif now - last_refresh >= SESSION_REFRESH_SECONDS:
+                    last_refresh = now
+                    if not scraper.soft_refresh():
+                        restart_reason = "Session expired"
+                if restart_reason:
+                    cycle_events.append(
                         "🔁 <b>Restarting session</b>\n\n"
-                        "Reached 50 attempts. Logging out and starting over..."
+                        f"{restart_reason}. Logging out and starting over..."
                     )
+                    flush_cycle_events(force_status=True)
                     check_count = 0
                     scraper = restart_session()
+                    session_started = last_refresh = time.monotonic()
                     continue
                 selected_location = locations[location_index]
-                logger.info(f"Check #{check_count}: Checking for available dates @ {selected_location}...")
-                
-                # Send Telegram notification for each attempt
-                telegram_bot.send_sync(
-                    f"🔄 <b>Attempt #{check_count}</b>\n\n"
-                    f"Checking for available dates @ {selected_location}..."
-                )
+                logger.debug("Check #%d: Checking for available dates @ %s...", check_count, selected_location)
                 
-                # Check if stop was requested before proceeding
-                if stop_event and stop_event.is_set():
-                    logger.info("Stop signal received. Stopping bot...")
-                    telegram_bot.send_sync("🛑 Bot stopped by user")
-                    break
+                # Attempts are summarized in a periodic Telegram status instead of one message each
+                telegram_bot.queue_status(check_count, selected_location)
                 
-                # Ensure we're on the appointment page
-                current_url = scraper.driver.current_url
-                if '/appointment' not in current_url:
+                # Ensure we're on the appointment page (one DOM probe while the session is healthy)
+                if not scraper.is_on_appointment_page():
                     logger.info("Not on appointment page, navigating to reschedule...")
-                    scraper.navigate_to_reschedule()
-                    scraper.select_location(selected_location)
-                else:
+                    if not scraper.return_to_search(selected_location):
+                        record_check_failure()
+                        continue
+                elif scraper.selected_counselor != selected_location:
                     # Ensure correct location is selected before checking
                     scraper.select_location(selected_location)
                 
-                # Check if stop was requested
-                if stop_event and stop_event.is_set():
-                    logger.info("Stop signal received. Stopping bot...")
-                    telegram_bot.send_sync("🛑 Bot stopped by user")
-                    break
+                # Pre-check the JSON days endpoint for every configured location at once;
+                # only traverse the calendar when it lists a date we would book
+                # (or when the endpoint can't be read for some location)
+                date_info = None
+                check_started = time.monotonic()
+                scraper.last_system_busy = False  # Set by either date check below when the site throttles us
+                days_by_facility = scraper.fetch_available_days(facility_ids)
+                best = None  # (date, location) of the earliest bookable date across locations
+                all_known = True
+                days_read = False  # Whether the endpoint answered for at least one location
+                calendar_failed = False
+                for loc, fid in location_facilities:
+                    days = days_by_facility.get(fid)
+                    if days is None:
+                        all_known = False
+                        continue
+                    days_read = True
+                    # days is sorted ISO strings: bisect to the first date >= earliest_date
+                    idx = bisect_left(days, earliest_date)
+                    first_ok = days[idx] if idx < len(days) and days[idx] <= latest_date and days[idx] < current_booking_date else None
+                    if first_ok and (best is None or first_ok < best[0]):
+                        best = (first_ok, loc)
+                
+                if best:
+                    logger.info("Days endpoint: bookable date %s @ %s", best[0], best[1])
+                    if best[1] != selected_location:
+                        # Jump straight to the location that has the date
+                        location_index = locations.index(best[1])
+                        selected_location = best[1]
+                        scraper.select_location(selected_location)
+                if best or (not all_known and not scraper.last_system_busy):
+                    # Check for available dates (will attempt to open calendar first)
+                    # System busy check will only happen if calendar fails to open
+                    # (a date from the days endpoint is selected as is, not the calendar's first one)
+                    date_info = scraper.check_available_dates(best[0] if best else None)
+                    calendar_failed = scraper.last_check_failed
+                elif not all_known:
+                    # The endpoint is throttling us: back off rather than load the calendar as well
+                    logger.debug("Days endpoint throttled - skipping the calendar fallback")
+                else:
+                    logger.debug("Days endpoint: no acceptable dates @ %s", locations_label)
                 
-                # Check for available dates (will attempt to open calendar first)
-                # System busy check will only happen if calendar fails to open
-                date_info = scraper.check_available_dates()
+                # Adapt the polling delay: double on throttling, grow on slow checks, else ease back
+                check_latencies.append(time.monotonic() - check_started)
+                poll_delay = next_poll_delay(poll_delay, check_interval, scraper.last_system_busy,
+                                             sum(check_latencies) / len(check_latencies))
+                if calendar_failed and not days_read:
+                    # Neither the days endpoint nor the calendar could be read: a failed check
+                    # even though nothing raised
+                    record_check_failure()
+                else:
+                    breaker.record_success()
                 
                 if date_info:
                     found_date_str = date_info.get('date', '')
                     found_location = date_info.get('location', 'Unknown')
                     
                     try:
-                        found_date = datetime.strptime(found_date_str, "%Y-%m-%d").date()
+                        found_ord = _parse_ymd(found_date_str).toordinal()
                     except ValueError:
-                        logger.warning(f"Invalid date format: {found_date_str}")
+                        logger.warning("Invalid date format: %s", found_date_str)
                         continue
                     
-                    logger.info(f"Available date found: {found_date_str} at {found_location}")
+                    logger.info("Available date found: %s at %s", found_date_str, found_location)
                     
                     # Check if date is within acceptable range
-                    if found_date < earliest_date_obj or found_date > latest_date_obj:
-                        logger.info(f"Found date {found_date_str} not within acceptable range ({earliest_date} to {latest_date})")
+                    if found_ord < earliest_ord or found_ord > latest_ord:
+                        logger.info("Found date %s not within acceptable range (%s to %s)", found_date_str, earliest_date, latest_date)
                         # Clear stale date value and retry by cycling consulate
                         scraper.clear_date_field()
                         logger.info("Out-of-range date detected. Cycling consulate and retrying...")
-                        telegram_bot.send_sync(
+                        cycle_events.append(
                             f"⏳ <b>Out-of-range date</b>\n\n"
                             f"Found {found_date_str} @ {found_location} (outside {earliest_date} to {latest_date}).\n"
                             f"Switching consulate and retrying..."
                         )
-                        telegram_bot.send_sync("🔄 <b>No dates found</b>\n\nSwitching location...")
-                        try:
-                            if len(locations) > 1:
-                                location_index = (location_index + 1) % len(locations)
-                                next_location = locations[location_index]
-                                if scraper.cycle_location(next_location, [selected_location]):
-                                    selected_location = next_location
-                                    logger.info("Location switched successfully - retrying")
-                                else:
-                                    logger.warning("Location switch failed - will retry in next cycle")
-                            else:
-                                logger.warning("Only one location configured - will retry")
-                        except Exception as e:
-                            logger.error(f"Error during consulate cycle: {e}", exc_info=True)
-                            logger.info("Will retry in next check cycle")
+                        cycle_events.append("🔄 <b>No dates found</b>\n\nSwitching location...")
+                        advance_location()
                         continue
                     
                     # Check if date is earlier than current booking
-                    if found_date >= current_booking:
-                        logger.info(f"Skipping booking. Found date {found_date_str} is not earlier than current booking {current_booking_date}")
-                        if len(locations) > 1:
-                            location_index = (location_index + 1) % len(locations)
-                            next_location = locations[location_index]
-                            scraper.cycle_location(next_location, [selected_location])
-                            selected_location = next_location
+                    if found_ord >= current_ord:
+                        logger.info("Skipping booking. Found date %s is not earlier than current booking %s", found_date_str, current_booking_date)
+                        advance_location()
                         continue
                     
-                    # Format date info for Telegram
-                    date_message = (
-                        f"📅 <b>Date:</b> {found_date_str}\n"
-                        f"📍 <b>Location:</b> {found_location}"
-                    )
-                    
                     # Notify user that date is available and booking is starting
-                    logger.info(f"FOUND SLOT ON {found_date_str}, location: {found_location}. Attempting to book...")
-                    telegram_bot.send_sync(
+                    logger.info("FOUND SLOT ON %s, location: %s. Attempting to book...", found_date_str, found_location)
+                    cycle_events.append(
                         f"🎯 <b>Date found: {found_date_str} @ {found_location}</b>\n\n"
                         f"✅ Date: {found_date_str}\n"
                         f"📍 Location: {found_location}\n\n"
                         f"⏳ Trying to book the appointment now..."
                     )
+                    flush_cycle_events(force_status=True)  # Don't hold the slot alert until the booking attempt finishes
                     
                     # Book appointment immediately (use first available time)
                     logger.info("Attempting to book appointment with first available time...")
@@ -541,91 +789,74 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
                     
                     if booking_success:
                         logger.info("Appointment booked successfully!")
-                        telegram_bot.send_sync(
+                        cycle_events.append(
                             f"🎉 <b>Appointment Booked!</b>\n\n"
                             f"📅 Date: {found_date_str}\n"
                             f"📍 Location: {found_location}\n"
                             f"✅ Status: Confirmed"
                         )
-                        # Update settings.py with new booking date
+                        # Persist the new booking date for the next run
                         update_settings_dates(found_date_str)
                         logger.info("Appointment booking completed. Exiting.")
                         break
                     else:
                         if date_info.get('time_unavailable'):
                             logger.warning("Time dropdown not available. Cycling consulate and retrying...")
-                            telegram_bot.send_sync(
+                            cycle_events.append(
                                 f"⏳ <b>No time slots available</b>\n\n"
                                 f"Found date {found_date_str} @ {found_location}, but time dropdown was empty.\n"
                                 f"Switching location and retrying..."
                             )
                         else:
                             logger.error("Failed to book appointment")
-                            telegram_bot.send_sync(
+                            cycle_events.append(
                                 f"⚠️ <b>Booking Failed!</b>\n\n"
                                 f"Slot was found on {found_date_str} @ {found_location}, but failed to book.\n"
                                 f"Please check manually."
                             )
                         # Cycle consulate and retry (no home navigation)
-                        telegram_bot.send_sync("🔄 <b>No dates found</b>\n\nSwitching location...")
-                        if len(locations) > 1:
-                            location_index = (location_index + 1) % len(locations)
-                            next_location = locations[location_index]
-                            scraper.cycle_location(next_location, [selected_location])
-                            selected_location = next_location
+                        cycle_events.append("🔄 <b>No dates found</b>\n\nSwitching location...")
+                        advance_location()
                 else:
-                    # Check if stop was requested
-                    if stop_event and stop_event.is_set():
-                        logger.info("Stop signal received. Stopping bot...")
-                        telegram_bot.send_sync("🛑 Bot stopped by user")
-                        break
-                    
-                    logger.info("No clickable dates found in calendar. Cycling consulate selection...")
-                    telegram_bot.send_sync(
+                    logger.debug("No clickable dates found in calendar. Cycling consulate selection...")
+                    cycle_events.append(
                         "🔄 <b>No dates found</b>\n\n"
                         "Switching consulate to refresh calendar..."
                     )
 
-                    # Cycle between configured locations without going home.
-                    try:
-                        if len(locations) > 1:
-                            location_index = (location_index + 1) % len(locations)
-                            next_location = locations[location_index]
-                            if scraper.cycle_location(next_location, [selected_location]):
-                                selected_location = next_location
-                                logger.info("Location switched successfully - retrying without home navigation")
-                            else:
-                                logger.warning("Location switch failed - will retry in next cycle")
-                        else:
-                            logger.warning("Only one location configured - retrying same location")
-                    except Exception as e:
-                        logger.error(f"Error during consulate cycle/retry: {e}", exc_info=True)
-                        logger.info("Will retry in next check cycle")
-                    
-                    # Mark that first check is done (so subsequent retries will wait)
-                    first_check = False
-                    
-                    # Check if stop was requested before continuing
-                    if stop_event and stop_event.is_set():
-                        logger.info("Stop signal received. Stopping bot...")
-                        telegram_bot.send_sync("🛑 Bot stopped by user")
-                        break
-                    
-                    continue  # Continue to next iteration of the while loop (will check dates immediately)
+                    # Cycle between configured locations without going home; the wait at the
+                    # top of the loop is the next stop check
+                    advance_location()
                 
+            except SystemBusy:
+                raise  # Ends the run; handled below
             except KeyboardInterrupt:
                 logger.info("Interrupted by user")
-                telegram_bot.send_sync("🛑 Bot stopped by user")
+                cycle_events.append("🛑 Bot stopped by user")
                 break
             except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}", exc_info=True)
-                telegram_bot.send_sync(f"⚠️ Error occurred: {str(e)}. Continuing to monitor...")
-                time.sleep(check_interval)
+                if stop_event.is_set():
+                    # A stop closes the browser, so the Selenium call in flight fails; that's not an error
+                    logger.info("Stop signal received. Stopping bot...")
+                    cycle_events.append("🛑 Bot stopped by user")
+                    break
+                logger.error("Error in monitoring loop: %s", e, exc_info=True)
+                cycle_events.append(f"⚠️ Error occurred: {str(e)}. Continuing to monitor...")
+                record_check_failure()
+                # The poll_delay wait at the top of the loop paces the retry
+            finally:
+                flush_cycle_events(force_status=stop_event.is_set())
     
+    except SystemBusy as e:
+        logger.error("%s", e)
+        logger.info("Exiting due to system busy error")
+        telegram_bot.send_async("⚠️ <b>System is busy</b>\n\nPlease try again.")
+        drain_timeout = BUSY_EXIT_DRAIN_SECONDS
+
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         if telegram_bot:
-            telegram_bot.send_sync(f"❌ Fatal error: {str(e)}")
+            telegram_bot.send_async(f"❌ Fatal error: {str(e)}")
     
     finally:
         # Cleanup
@@ -633,9 +864,17 @@ def main(gui_inputs: Optional[Dict[str, Any]] = None, stop_event: Optional[threa
         if scraper:
             scraper.close()
         if telegram_bot:
-            telegram_bot.stop()
+            telegram_bot.stop(drain_timeout=drain_timeout)  # Delivers queued send_async messages first (exit/fatal notices included)
         logger.info("Exiting")
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="US Visa Appointment Bot (CLI)")
+    parser.add_argument(
+        "--config",
+        default=os.getenv("VISABOT_CONFIG") or None,
+        help="JSON file with the bot inputs; skips the interactive prompts (default: $VISABOT_CONFIG)"
+    )
+    args = parser.parse_args()
+    main(config_path=args.config)
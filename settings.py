@@ -1,25 +1,14 @@
 """Settings configuration for US Visa Appointment Bot."""
+import json
+import logging
 import os
-from dotenv import load_dotenv
+import re
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, List, Tuple
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Telegram Bot Configuration
-# IMPORTANT: Set these in .env file for security (never commit .env to git)
-# Default values provided for convenience but should be overridden in .env
-TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', os.getenv('TELEGRAM_TOKEN', ''))
-TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', '2023815877')
-
-LOGIN_URL = os.getenv('VISA_URL', 'https://ais.usvisa-info.com/en-ca/niv/users/sign_in')
-
-# Date Range Settings
-# Earliest date you're willing to accept (YYYY-MM-DD format)
-EARLIEST_ACCEPTABLE_DATE = os.getenv('EARLIEST_ACCEPTABLE_DATE', '2026-01-31')
-# Latest date you're willing to accept (YYYY-MM-DD format)
-LATEST_ACCEPTABLE_DATE = os.getenv('LATEST_ACCEPTABLE_DATE', '2026-12-31')
-# Your current booking date - bot will only book if it finds an earlier date
-CURRENT_BOOKING_DATE = os.getenv('CURRENT_BOOKING_DATE', '2027-06-30')
+logger = logging.getLogger(__name__)
 
 # Consulate/Location Settings
 CONSULATES = {
@@ -31,14 +20,139 @@ CONSULATES = {
     "Toronto": 94,
     "Vancouver": 95
 }
+CONSULATE_NAMES = tuple(CONSULATES)  # Snapshot of consulate names for menus/prompts
+
+# Booking date defaults (YYYY-MM-DD format), used when not set in .env or STATE_FILE
+DEFAULT_LATEST_ACCEPTABLE_DATE = '2026-12-31'
+DEFAULT_CURRENT_BOOKING_DATE = '2027-06-30'
+
+# Email rule shared by every input path (use fullmatch): one "@", no whitespace, a dot in the domain
+EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# Strict YYYY-MM-DD shape; date.fromisoformat alone also takes 20260131 and week dates on 3.11+
+_DATE_SHAPE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Booking state written by update_settings_dates() in main.py after a successful booking
+STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'booking_state.json')
+
+
+def parse_date(value: Any) -> date:
+    """Parse a strict YYYY-MM-DD date string.
+
+    Raises:
+        ValueError: If the value is not a valid YYYY-MM-DD date
+    """
+    if not isinstance(value, str) or not _DATE_SHAPE.fullmatch(value):
+        raise ValueError(f"Expected YYYY-MM-DD, got {value!r}")
+    return date.fromisoformat(value)
+
+
+def load_state() -> dict:
+    """Return the saved booking state, or an empty dict if there is none (or it is unreadable)."""
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable snapshot of the bot configuration, built once by get_settings()."""
+
+    # Explicit slots (dataclass(slots=True) needs Python 3.10+)
+    __slots__ = (
+        'telegram_bot_token', 'telegram_chat_id', 'login_url',
+        'earliest_acceptable_date', 'latest_acceptable_date', 'current_booking_date',
+        'user_consulate', 'user_consulate_2', 'show_gui', 'check_interval', 'issues',
+    )
+
+    telegram_bot_token: str
+    telegram_chat_id: str
+    login_url: str
+    earliest_acceptable_date: str
+    latest_acceptable_date: str
+    current_booking_date: str
+    user_consulate: str
+    user_consulate_2: str
+    show_gui: bool
+    check_interval: int
+    # Invalid .env/state values that were replaced by their defaults, for the GUI/CLI to report
+    issues: Tuple[str, ...]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load .env once and return the cached settings snapshot.
+
+    Nothing is read at import time: the first call (at GUI/bot startup) loads .env.
+    Invalid values never raise; each is logged, listed in Settings.issues and replaced by its default.
+    """
+    # Load environment variables from .env file (imported here so `import settings` stays cheap)
+    from dotenv import load_dotenv
+    load_dotenv()
+    # Plain-dict snapshot: one pass over os.environ instead of a lookup per field
+    env = dict(os.environ)
+    state = load_state()
+    issues: List[str] = []
+
+    def invalid(name: str, value: Any, expected: str, default: Any) -> Any:
+        issues.append(f"Invalid {name}: {value!r} ({expected}); using {default!r}")
+        logger.warning("%s", issues[-1])
+        return default
+
+    def date_setting(name: str, value: str, default: str) -> str:
+        try:
+            return parse_date(value).isoformat()
+        except ValueError:
+            return invalid(name, value, "expected YYYY-MM-DD", default)
+
+    def consulate_setting(name: str, value: str, default: str) -> str:
+        if not value:
+            return default  # Set but empty: same as unset
+        if value in CONSULATES:
+            return value
+        return invalid(name, value, f"choose from {', '.join(CONSULATES)}", default)
 
-# Your consulate's city (choose from CONSULATES above)
-USER_CONSULATE = os.getenv('LOCATION', 'Toronto')
-# Optional second consulate for alternating checks
-USER_CONSULATE_2 = os.getenv('LOCATION_2', '')
+    check_interval_raw = env.get('CHECK_INTERVAL', '5')
+    try:
+        check_interval = int(check_interval_raw)
+    except ValueError:
+        check_interval = 0
+    if check_interval <= 0:
+        check_interval = invalid('CHECK_INTERVAL', check_interval_raw, "expected a positive integer", 5)
 
-# Browser Settings
-SHOW_GUI = os.getenv('HEADLESS', 'false').lower() != 'true'  # Show browser window
+    latest_default = date_setting('latest_acceptable_date in ' + STATE_FILE,
+                                  state.get('latest_acceptable_date', DEFAULT_LATEST_ACCEPTABLE_DATE),
+                                  DEFAULT_LATEST_ACCEPTABLE_DATE)
+    current_default = date_setting('current_booking_date in ' + STATE_FILE,
+                                   state.get('current_booking_date', DEFAULT_CURRENT_BOOKING_DATE),
+                                   DEFAULT_CURRENT_BOOKING_DATE)
 
-# Timing Settings
-CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', '5'))  # Check interval in seconds (default: 5 seconds)
+    return Settings(
+        # Telegram Bot Configuration
+        # IMPORTANT: Set these in .env file for security (never commit .env to git)
+        telegram_bot_token=env.get('TELEGRAM_BOT_TOKEN', env.get('TELEGRAM_TOKEN', '')),
+        telegram_chat_id=env.get('TELEGRAM_CHAT_ID', '2023815877'),
+        login_url=env.get('VISA_URL', 'https://ais.usvisa-info.com/en-ca/niv/users/sign_in'),
+        # Date Range Settings
+        # Earliest date you're willing to accept
+        earliest_acceptable_date=date_setting('EARLIEST_ACCEPTABLE_DATE',
+                                              env.get('EARLIEST_ACCEPTABLE_DATE', '2026-01-31'), '2026-01-31'),
+        # Latest date you're willing to accept
+        latest_acceptable_date=date_setting('LATEST_ACCEPTABLE_DATE',
+                                            env.get('LATEST_ACCEPTABLE_DATE', latest_default), latest_default),
+        # Your current booking date - bot will only book if it finds an earlier date
+        current_booking_date=date_setting('CURRENT_BOOKING_DATE',
+                                          env.get('CURRENT_BOOKING_DATE', current_default), current_default),
+        # Your consulate's city (choose from CONSULATES above)
+        user_consulate=consulate_setting('LOCATION', env.get('LOCATION', 'Toronto'), 'Toronto'),
+        # Optional second consulate for alternating checks
+        user_consulate_2=consulate_setting('LOCATION_2', env.get('LOCATION_2', ''), ''),
+        # Browser Settings
+        show_gui=env.get('HEADLESS', 'false').lower() != 'true',  # Show browser window
+        # Timing Settings
+        check_interval=check_interval,  # Check interval in seconds (default: 5 seconds)
+        issues=tuple(issues),
+    )
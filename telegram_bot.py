@@ -4,31 +4,76 @@ import asyncio
 from telegram import Update, Bot
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 from telegram.error import TelegramError, BadRequest
+from telegram.request import HTTPXRequest
 from typing import Optional, Callable
 import threading
 import queue
+import time
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between "still checking" status messages (see queue_status/flush_status)
+STATUS_FLUSH_INTERVAL = 300
+# Keep-alive connections to api.telegram.org for outgoing calls (long polling has its own)
+SEND_POOL_SIZE = 4
+# Queued sends: at most RATE_LIMIT_MESSAGES per sliding RATE_LIMIT_WINDOW seconds (Telegram's per-chat
+# flood limit), and a message identical to the previous one within the window is dropped
+RATE_LIMIT_MESSAGES = 20
+RATE_LIMIT_WINDOW = 60.0
+# Seconds to wait for the bot's loop to start polling before the constructor returns anyway
+STARTUP_TIMEOUT = 10
+# Seconds stop() waits for polling and the Application to shut down
+SHUTDOWN_TIMEOUT = 15
+# Seconds to wait for a reply to a booking confirmation / preferred-time prompt
+CONFIRMATION_TIMEOUT = 300
+TIME_SELECTION_TIMEOUT = 120
+
 
 class TelegramNotifier:
     """Handles Telegram notifications and confirmation requests."""
     
+    __slots__ = (
+        'bot_token', 'chat_id', 'chat_id_event', 'bot', 'stop_callback',
+        'pending_confirmation', 'pending_time_selection', 'pending_input', 'input_queue',
+        '_confirmation_future', '_time_future', 'app', '_loop', '_thread',
+        '_status_lock', '_pending_attempts', '_pending_status', '_last_status_flush',
+        '_send_queue', '_ready', '_closed',
+    )
+    
     def __init__(self, bot_token: str, chat_id: str, stop_callback: Optional[Callable[[], None]] = None):
         """Initialize Telegram bot."""
         self.bot_token = bot_token
         self.chat_id = str(chat_id)  # Ensure string type
-        self.bot = Bot(token=bot_token)
+        # Set once a usable chat ID is known (configured or auto-detected from an incoming message)
+        self.chat_id_event = threading.Event()
+        if self.chat_id not in ('', '0'):
+            self.chat_id_event.set()
+        # One Bot (and connection pool) shared with the Application, so sends reuse its open connections;
+        # HTTP/2 multiplexes bursts of sends over one TLS connection (closed by app.shutdown() in stop())
+        self.bot = Bot(token=bot_token, request=HTTPXRequest(connection_pool_size=SEND_POOL_SIZE, http_version="2"))
         self.stop_callback = stop_callback
         self.pending_confirmation: bool = False
         self.pending_time_selection: bool = False
         self.pending_input: bool = False
         self.input_queue = queue.Queue()
-        self.confirmation_queue = queue.Queue()
-        self.time_queue = queue.Queue()
+        # Resolved by _handle_message on the bot's loop while a confirmation/time prompt is pending
+        self._confirmation_future: Optional[asyncio.Future] = None
+        self._time_future: Optional[asyncio.Future] = None
         self.app = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._thread: Optional[threading.Thread] = None
+        # Coalesced monitoring-attempt status, sent at most every STATUS_FLUSH_INTERVAL seconds
+        self._status_lock = threading.Lock()
+        self._pending_attempts = 0
+        self._pending_status: Optional[str] = None
+        self._last_status_flush = time.monotonic()
+        # Fire-and-forget sends (send_async), delivered in order by _send_worker on the bot's loop
+        self._send_queue: Optional["asyncio.Queue[str]"] = None
+        # Set once the bot's loop is running (or its startup has failed)
+        self._ready = threading.Event()
+        # Set by stop(): app.shutdown() closes the shared Bot's HTTP client, so nothing can be sent after it
+        self._closed = False
         self._setup_bot()
     
     def _setup_bot(self):
@@ -38,7 +83,8 @@ class TelegramNotifier:
             self._loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self._loop)
             
-            self.app = Application.builder().token(self.bot_token).build()
+            self._send_queue = asyncio.Queue()
+            self.app = Application.builder().bot(self.bot).build()
             
             # Add handlers
             self.app.add_handler(CommandHandler("start", self._start_command))
@@ -47,27 +93,36 @@ class TelegramNotifier:
             self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message))
             
             # Run bot
-            self._loop.run_until_complete(self.app.initialize())
-            self._loop.run_until_complete(self.app.start())
-            self._loop.run_until_complete(self.app.updater.start_polling())
+            try:
+                self._loop.run_until_complete(self.app.initialize())
+                self._loop.run_until_complete(self.app.start())
+                self._loop.run_until_complete(self.app.updater.start_polling())
+            except Exception as e:
+                logger.error(f"Telegram bot failed to start: {e}")
+                self._ready.set()
+                return
+            self._loop.create_task(self._send_worker())
+            # Signal readiness from inside the loop, so _loop.is_running() is already true
+            self._loop.call_soon(self._ready.set)
             self._loop.run_forever()
         
         self._thread = threading.Thread(target=run_bot, daemon=True)
         self._thread.start()
-        # Give bot time to initialize
-        import time
-        time.sleep(2)
+        # Wait until the bot is polling rather than sleeping a fixed time
+        if not self._ready.wait(timeout=STARTUP_TIMEOUT):
+            logger.warning("Telegram bot not ready after %ss; continuing anyway", STARTUP_TIMEOUT)
     
     async def _start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command."""
         # Store chat ID if it matches
         incoming_chat_id = str(update.message.chat_id)
         if incoming_chat_id != self.chat_id:
-            logger.info(f"Received message from chat ID: {incoming_chat_id} (current: {self.chat_id})")
+            logger.info("Received message from chat ID: %s (current: %s)", incoming_chat_id, self.chat_id)
             # If chat_id was empty/placeholder, update it
-            if not self.chat_id or self.chat_id == '0' or self.chat_id == '':
+            if not self.chat_id_event.is_set():
                 self.chat_id = incoming_chat_id
-                logger.info(f"Updated chat ID to: {self.chat_id}")
+                logger.info("Updated chat ID to: %s", self.chat_id)
+                self.chat_id_event.set()
         
         await update.message.reply_text(
             "👋 US Visa Appointment Bot is running!\n\n"
@@ -89,24 +144,24 @@ class TelegramNotifier:
             return
         await update.message.reply_text("🛑 Stopping the bot...")
         if self.stop_callback:
+            # The owner (main()) winds down and calls stop() itself, so its final messages still go out
             try:
                 self.stop_callback()
             except Exception as e:
                 logger.error(f"Error in stop callback: {e}")
-        # Stop Telegram polling loop after issuing stop
-        try:
-            self.stop()
-        except Exception as e:
-            logger.error(f"Error stopping Telegram bot: {e}")
+        else:
+            # stop() waits on this loop, so it has to run on another thread
+            threading.Thread(target=self.stop, daemon=True).start()
     
     async def _handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle incoming messages."""
         incoming_chat_id = str(update.message.chat_id)
         
         # If chat_id was empty/placeholder, update it with the first message
-        if not self.chat_id or self.chat_id == '0' or self.chat_id == '':
+        if not self.chat_id_event.is_set():
             self.chat_id = incoming_chat_id
-            logger.info(f"Auto-detected chat ID: {self.chat_id}")
+            logger.info("Auto-detected chat ID: %s", self.chat_id)
+            self.chat_id_event.set()
         
         if incoming_chat_id != self.chat_id:
             return
@@ -118,21 +173,21 @@ class TelegramNotifier:
             # User is providing preferred time
             if text_lower in ['skip', 'any', 'first', 'auto']:
                 self.pending_time_selection = False
-                self.time_queue.put(None)
+                self._resolve(self._time_future, None)
                 await update.message.reply_text("✅ Will select first available time.")
             else:
                 # Treat as time input
                 self.pending_time_selection = False
-                self.time_queue.put(text)
+                self._resolve(self._time_future, text)
                 await update.message.reply_text(f"✅ Preferred time set to: {text}")
         elif self.pending_confirmation:
             if text_lower in ['yes', 'y', 'confirm', 'ok', 'book']:
                 self.pending_confirmation = False
-                self.confirmation_queue.put(True)
+                self._resolve(self._confirmation_future, True)
                 await update.message.reply_text("✅ Confirmed! Booking the appointment...")
             elif text_lower in ['no', 'n', 'cancel', 'skip']:
                 self.pending_confirmation = False
-                self.confirmation_queue.put(False)
+                self._resolve(self._confirmation_future, False)
                 await update.message.reply_text("❌ Cancelled. Will continue checking for other dates.")
             else:
                 await update.message.reply_text(
@@ -144,11 +199,23 @@ class TelegramNotifier:
             self.input_queue.put(text)
             await update.message.reply_text("✅ Received.")
     
+    @staticmethod
+    def _resolve(future: Optional[asyncio.Future], value):
+        """Deliver a reply to a waiting request_* coroutine, unless it already timed out."""
+        if future is not None and not future.done():
+            future.set_result(value)
+    
+    def _chat_id_ready(self, message: str) -> bool:
+        """Return whether a chat ID is known, logging the dropped message if not."""
+        if self.chat_id_event.is_set():
+            return True
+        logger.warning("Cannot send notification - chat_id not set yet. Message: %s...", message[:50])
+        return False
+    
     async def send_notification(self, message: str):
         """Send a notification message."""
         # Don't send if chat_id is not set yet
-        if not self.chat_id or self.chat_id == '0' or self.chat_id == '':
-            logger.warning(f"Cannot send notification - chat_id not set yet. Message: {message[:50]}...")
+        if not self._chat_id_ready(message):
             return
         
         try:
@@ -157,13 +224,14 @@ class TelegramNotifier:
                 text=message,
                 parse_mode='HTML'
             )
-            logger.info(f"Sent Telegram notification: {message[:50]}...")
+            logger.info("Sent Telegram notification: %s...", message[:50])
         except BadRequest as e:
             error_msg = str(e)
             if "chat not found" in error_msg.lower() or "chat_id is empty" in error_msg.lower():
                 logger.error(f"Chat not found - invalid chat_id: {self.chat_id}. Please send /start to your bot first.")
                 # Reset chat_id so it can be detected again
                 self.chat_id = '0'
+                self.chat_id_event.clear()
             else:
                 logger.error(f"Telegram BadRequest error: {e}")
         except TelegramError as e:
@@ -173,6 +241,7 @@ class TelegramNotifier:
     
     async def request_confirmation(self, date_info: str) -> bool:
         """Request confirmation from user and wait for response."""
+        self._confirmation_future = asyncio.get_running_loop().create_future()
         self.pending_confirmation = True
         
         message = (
@@ -183,15 +252,16 @@ class TelegramNotifier:
         
         await self.send_notification(message)
         
-        # Wait for confirmation (timeout after 5 minutes)
+        # Wait for confirmation (timeout after 5 minutes) without blocking the bot's loop
         try:
-            confirmation = self.confirmation_queue.get(timeout=300)
-            return confirmation
-        except queue.Empty:
+            return await asyncio.wait_for(self._confirmation_future, timeout=CONFIRMATION_TIMEOUT)
+        except asyncio.TimeoutError:
             self.pending_confirmation = False
             logger.warning("Confirmation timeout - no response received")
             await self.send_notification("⏱️ Confirmation timeout. Continuing to check for other dates.")
             return False
+        finally:
+            self._confirmation_future = None
     
     async def request_preferred_time(self, available_times: list) -> Optional[str]:
         """Request preferred time from user and wait for response.
@@ -202,6 +272,7 @@ class TelegramNotifier:
         Returns:
             Preferred time string or None if user wants first available
         """
+        self._time_future = asyncio.get_running_loop().create_future()
         self.pending_time_selection = True
         
         if available_times:
@@ -221,32 +292,89 @@ class TelegramNotifier:
         
         await self.send_notification(message)
         
-        # Wait for time selection (timeout after 2 minutes)
+        # Wait for time selection (timeout after 2 minutes) without blocking the bot's loop
         try:
-            preferred_time = self.time_queue.get(timeout=120)
-            return preferred_time
-        except queue.Empty:
+            return await asyncio.wait_for(self._time_future, timeout=TIME_SELECTION_TIMEOUT)
+        except asyncio.TimeoutError:
             self.pending_time_selection = False
             logger.warning("Time selection timeout - will use first available")
             await self.send_notification("⏱️ Time selection timeout. Will select first available time.")
             return None
+        finally:
+            self._time_future = None
     
+    async def _send_worker(self):
+        """Deliver queued send_async messages one at a time, in order, within the rate limit."""
+        sent_at = deque(maxlen=RATE_LIMIT_MESSAGES)  # Monotonic times of the most recent sends
+        last_message = None
+        while True:
+            message = await self._send_queue.get()
+            try:
+                now = time.monotonic()
+                if message == last_message and sent_at and now - sent_at[-1] < RATE_LIMIT_WINDOW:
+                    logger.debug("Dropping repeated Telegram message: %s...", message[:50])
+                    continue
+                if len(sent_at) == RATE_LIMIT_MESSAGES and now - sent_at[0] < RATE_LIMIT_WINDOW:
+                    await asyncio.sleep(RATE_LIMIT_WINDOW - (now - sent_at[0]))
+                await self.send_notification(message)
+                last_message = message
+                sent_at.append(time.monotonic())
+            finally:
+                self._send_queue.task_done()
+
+    def _loop_ready(self, what: str) -> bool:
+        """Return whether the bot's loop can take work, logging what is dropped if not.
+        
+        The shared Bot's HTTP client belongs to that loop (and is closed by stop()),
+        so there is no fallback to sending from another loop.
+        """
+        if not self._closed and self._loop and self._loop.is_running():
+            return True
+        logger.warning("Telegram bot is not running - dropping %s", what)
+        return False
+
+    def send_async(self, message: str):
+        """Queue a message for the bot's event loop and return immediately."""
+        # Checked here too, so nothing is scheduled on the loop before a chat ID is known
+        if not self._chat_id_ready(message) or not self._loop_ready(f"message: {message[:50]}..."):
+            return
+        self._loop.call_soon_threadsafe(self._send_queue.put_nowait, message)
+
     def send_sync(self, message: str):
         """Synchronous wrapper for sending messages."""
-        if self._loop and self._loop.is_running():
-            future = asyncio.run_coroutine_threadsafe(self.send_notification(message), self._loop)
-            future.result(timeout=30)
-        else:
-            asyncio.run(self.send_notification(message))
+        if not self._chat_id_ready(message) or not self._loop_ready(f"message: {message[:50]}..."):
+            return
+        future = asyncio.run_coroutine_threadsafe(self.send_notification(message), self._loop)
+        future.result(timeout=30)
+
+    def queue_status(self, check_count: int, location: str):
+        """Record a monitoring attempt; it is reported by the next due flush_status()."""
+        with self._status_lock:
+            self._pending_attempts += 1
+            self._pending_status = f"latest #{check_count} @ {location}"
+
+    def flush_status(self, force: bool = False):
+        """Queue one summary of the recorded attempts if STATUS_FLUSH_INTERVAL has passed (or force is set)."""
+        with self._status_lock:
+            now = time.monotonic()
+            if not self._pending_attempts or (not force and now - self._last_status_flush < STATUS_FLUSH_INTERVAL):
+                return
+            attempts, status = self._pending_attempts, self._pending_status
+            self._pending_attempts = 0
+            self._pending_status = None
+            self._last_status_flush = now
+        self.send_async(
+            f"🔄 <b>Still checking</b>\n\n"
+            f"{attempts} attempt(s) since the last update ({status})"
+        )
 
     def request_input_sync(self, prompt: str, timeout: int = 300) -> str:
         """Request a single input value from the user via Telegram."""
+        if not self._loop_ready("input request"):
+            return ""
         self.pending_input = True
-        if self._loop and self._loop.is_running():
-            future = asyncio.run_coroutine_threadsafe(self.send_notification(prompt), self._loop)
-            future.result(timeout=30)
-        else:
-            asyncio.run(self.send_notification(prompt))
+        future = asyncio.run_coroutine_threadsafe(self.send_notification(prompt), self._loop)
+        future.result(timeout=30)
         try:
             value = self.input_queue.get(timeout=timeout)
             return value
@@ -256,24 +384,51 @@ class TelegramNotifier:
             return ""
     
     def request_confirmation_sync(self, date_info: str) -> bool:
-        """Synchronous wrapper for requesting confirmation."""
-        if self._loop and self._loop.is_running():
-            future = asyncio.run_coroutine_threadsafe(self.request_confirmation(date_info), self._loop)
-            return future.result(timeout=300)
-        else:
-            return asyncio.run(self.request_confirmation(date_info))
+        """Synchronous wrapper for requesting confirmation (False if the bot is not running)."""
+        if not self._loop_ready("confirmation request"):
+            return False
+        future = asyncio.run_coroutine_threadsafe(self.request_confirmation(date_info), self._loop)
+        # Margin over CONFIRMATION_TIMEOUT so the coroutine's own timeout message goes out first
+        return future.result(timeout=CONFIRMATION_TIMEOUT + 30)
     
     def request_preferred_time_sync(self, available_times: list) -> Optional[str]:
-        """Synchronous wrapper for requesting preferred time."""
-        if self._loop and self._loop.is_running():
-            future = asyncio.run_coroutine_threadsafe(self.request_preferred_time(available_times), self._loop)
-            return future.result(timeout=120)
-        else:
-            return asyncio.run(self.request_preferred_time(available_times))
+        """Synchronous wrapper for requesting preferred time (None if the bot is not running)."""
+        if not self._loop_ready("time selection request"):
+            return None
+        future = asyncio.run_coroutine_threadsafe(self.request_preferred_time(available_times), self._loop)
+        return future.result(timeout=TIME_SELECTION_TIMEOUT + 30)
     
-    def stop(self):
-        """Stop the bot."""
-        if self.app and self._loop:
-            asyncio.run_coroutine_threadsafe(self.app.stop(), self._loop)
-            asyncio.run_coroutine_threadsafe(self.app.shutdown(), self._loop)
-            self._loop.call_soon_threadsafe(self._loop.stop)
+    async def _shutdown_app(self):
+        """Stop polling and the Application, then shut it down (which closes the Bot's HTTP client)."""
+        if self.app.updater and self.app.updater.running:
+            await self.app.updater.stop()
+        if self.app.running:
+            await self.app.stop()
+        await self.app.shutdown()
+
+    def stop(self, drain: bool = True, drain_timeout: float = 30.0):
+        """Stop the bot and wait for its shutdown; later sends are dropped with a warning.
+        
+        Must not be called on the bot's own event loop thread, which has to keep running to finish it.
+        
+        Args:
+            drain: Deliver queued send_async messages first
+            drain_timeout: Maximum seconds to wait for the queue to drain
+        """
+        if self._closed:
+            return
+        running = bool(self._loop and self._loop.is_running())
+        if drain and running:
+            try:
+                asyncio.run_coroutine_threadsafe(self._send_queue.join(), self._loop).result(timeout=drain_timeout)
+            except Exception as e:
+                logger.warning("Gave up waiting for queued Telegram messages: %s", e)
+        self._closed = True
+        if not running:
+            return
+        if self.app:
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown_app(), self._loop).result(timeout=SHUTDOWN_TIMEOUT)
+            except Exception as e:
+                logger.warning("Telegram bot did not shut down cleanly: %s", e)
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -1,8 +1,34 @@
 """Telegram-based input collection for bot configuration."""
+import re
 from datetime import datetime
 from typing import Dict, Any, Optional
 
-from settings import CONSULATES
+from settings import CONSULATES, EMAIL_RE
+
+# Case-insensitive consulate lookup, built once
+_CONSULATE_BY_LOWER = {name.lower(): name for name in CONSULATES}
+_CONSULATES_AVAILABLE = ", ".join(CONSULATES)
+
+_is_valid_email = EMAIL_RE.fullmatch
+# Cheap YYYY-MM-DD shape check; strptime then only runs on plausible dates
+_date_shape = re.compile(r"\d{4}-\d{2}-\d{2}").fullmatch
+
+
+def _is_valid_date(value: str) -> bool:
+    if not _date_shape(value):
+        return False
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def _is_valid_interval(value: str) -> bool:
+    try:
+        return int(value) > 0
+    except ValueError:
+        return False
 
 
 def get_inputs_via_telegram(
@@ -33,22 +59,6 @@ def get_inputs_via_telegram(
             return value
         raise ValueError("Too many invalid inputs.")
 
-    def is_valid_email(value: str) -> bool:
-        return "@" in value and "." in value.split("@")[-1]
-
-    def is_valid_date(value: str) -> bool:
-        try:
-            datetime.strptime(value, "%Y-%m-%d")
-            return True
-        except ValueError:
-            return False
-
-    def is_valid_interval(value: str) -> bool:
-        try:
-            return int(value) > 0
-        except ValueError:
-            return False
-
     telegram_bot.send_sync(
         "📝 <b>Telegram setup</b>\n\n"
         "Please provide the following details.\n"
@@ -59,7 +69,7 @@ def get_inputs_via_telegram(
     email = ask(
         "📧 <b>Email:</b>\nPlease enter your visa account email.",
         required=True,
-        validator=is_valid_email,
+        validator=_is_valid_email,
         error_msg="❌ Invalid email. Please enter a valid email address."
     )
 
@@ -71,54 +81,46 @@ def get_inputs_via_telegram(
 
     location_prompt = (
         "📍 <b>Location 1:</b>\n"
-        f"Available: {', '.join(CONSULATES.keys())}\n"
+        f"Available: {_CONSULATES_AVAILABLE}\n"
         f"Default: {defaults['location']}\n"
         "Reply with a city name or leave empty to use default."
     )
     location_input = ask(location_prompt, default=defaults["location"])
-    location = defaults["location"]
-    for key in CONSULATES.keys():
-        if key.lower() == location_input.strip().lower():
-            location = key
-            break
+    location = _CONSULATE_BY_LOWER.get(location_input.strip().lower(), defaults["location"])
 
     location2_prompt = (
         "📍 <b>Location 2 (optional):</b>\n"
-        f"Available: {', '.join(CONSULATES.keys())}\n"
+        f"Available: {_CONSULATES_AVAILABLE}\n"
         "Reply with a city name or leave empty to skip."
     )
     location2_input = ask(location2_prompt, default=defaults.get("location2", ""))
-    location2 = ""
-    for key in CONSULATES.keys():
-        if key.lower() == location2_input.strip().lower():
-            location2 = key
-            break
+    location2 = _CONSULATE_BY_LOWER.get(location2_input.strip().lower(), "")
 
     earliest_date = ask(
         f"📅 <b>Earliest Acceptable Date:</b>\nDefault: {defaults['earliest_date']}",
         default=defaults["earliest_date"],
-        validator=is_valid_date,
+        validator=_is_valid_date,
         error_msg="❌ Invalid date. Use YYYY-MM-DD."
     )
 
     latest_date = ask(
         f"📅 <b>Latest Acceptable Date:</b>\nDefault: {defaults['latest_date']}",
         default=defaults["latest_date"],
-        validator=is_valid_date,
+        validator=_is_valid_date,
         error_msg="❌ Invalid date. Use YYYY-MM-DD."
     )
 
     current_date = ask(
         f"📅 <b>Current Booking Date:</b>\nDefault: {defaults['current_date']}",
         default=defaults["current_date"],
-        validator=is_valid_date,
+        validator=_is_valid_date,
         error_msg="❌ Invalid date. Use YYYY-MM-DD."
     )
 
     check_interval = ask(
         f"⏱️ <b>Check Interval (seconds):</b>\nDefault: {defaults['check_interval']}",
         default=str(defaults["check_interval"]),
-        validator=is_valid_interval,
+        validator=_is_valid_interval,
         error_msg="❌ Invalid number. Enter a positive integer."
     )
 
@@ -0,0 +1,26 @@
+"""Tests for the monitoring loop's polling backoff."""
+import unittest
+
+import main
+
+
+class NextPollDelayTest(unittest.TestCase):
+    def test_throttling_doubles_delay(self):
+        self.assertEqual(main.next_poll_delay(5, 5, busy=True, mean_latency=1.0), 10)
+
+    def test_throttling_is_capped(self):
+        delay = 5
+        for _ in range(20):
+            delay = main.next_poll_delay(delay, 5, busy=True, mean_latency=1.0)
+        self.assertEqual(delay, main.MAX_BACKOFF_SECONDS)
+
+    def test_slow_checks_grow_delay(self):
+        self.assertEqual(main.next_poll_delay(10, 5, busy=False, mean_latency=main.SLOW_CHECK_SECONDS + 1), 15)
+
+    def test_healthy_checks_ease_back_to_interval(self):
+        self.assertEqual(main.next_poll_delay(100, 5, busy=False, mean_latency=1.0), 90)
+        self.assertEqual(main.next_poll_delay(5, 5, busy=False, mean_latency=1.0), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
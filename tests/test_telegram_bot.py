@@ -0,0 +1,62 @@
+"""Tests for TelegramNotifier's shutdown (needs python-telegram-bot[http2] installed)."""
+import asyncio
+import importlib.util
+import threading
+import unittest
+from unittest import mock
+
+HAVE_TELEGRAM = importlib.util.find_spec("telegram") is not None
+
+if HAVE_TELEGRAM:
+    from telegram_bot import TelegramNotifier
+
+
+async def _new_queue():
+    return asyncio.Queue()
+
+
+@unittest.skipUnless(HAVE_TELEGRAM, "python-telegram-bot not installed")
+class SendAfterStopTest(unittest.TestCase):
+    def setUp(self):
+        # Run the notifier on a bare event loop instead of a polling Application (no network)
+        with mock.patch.object(TelegramNotifier, "_setup_bot"):
+            self.notifier = TelegramNotifier("123456:TEST-TOKEN", "42")
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.notifier._loop = self.loop
+        self.notifier._send_queue = asyncio.run_coroutine_threadsafe(_new_queue(), self.loop).result(5)
+
+    def tearDown(self):
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+    def test_stop_stops_the_loop(self):
+        self.notifier.stop()
+        self.thread.join(5)
+        self.assertFalse(self.loop.is_running())
+
+    def test_sends_after_stop_are_refused(self):
+        self.notifier.stop()
+        with mock.patch.object(TelegramNotifier, "send_notification") as send, \
+                mock.patch("asyncio.run") as run, \
+                self.assertLogs("telegram_bot", "WARNING"):
+            self.notifier.send_async("late status")
+            self.notifier.send_sync("late status")
+            self.assertEqual(self.notifier.request_input_sync("prompt", timeout=1), "")
+            self.assertFalse(self.notifier.request_confirmation_sync("2026-01-01 @ Toronto"))
+            self.assertIsNone(self.notifier.request_preferred_time_sync(["08:00"]))
+        send.assert_not_called()
+        run.assert_not_called()
+
+    def test_stop_is_idempotent(self):
+        self.notifier.stop()
+        self.notifier.stop()
+        self.thread.join(5)
+        self.assertFalse(self.loop.is_running())
+
+
+if __name__ == "__main__":
+    unittest.main()
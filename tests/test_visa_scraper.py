@@ -0,0 +1,70 @@
+"""Tests for VisaScraper's per-check status flags (needs selenium and psutil installed)."""
+import importlib.util
+import unittest
+
+HAVE_DEPS = all(importlib.util.find_spec(name) for name in ("selenium", "psutil"))
+
+if HAVE_DEPS:
+    import main
+    from visa_scraper import VisaScraper
+
+
+class _DateField:
+    """An empty appointment date field."""
+
+    def get_attribute(self, name):
+        return ""
+
+
+class _DaysDriver:
+    """Stands in for the browser: the days endpoint answers with fixed per-facility results
+    and the reschedule form shows an empty date field."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def execute_async_script(self, script, facility_ids):
+        return self.results
+
+    def execute_script(self, script, *args):
+        return None
+
+    def find_element(self, by, value):
+        return _DateField()
+
+
+@unittest.skipUnless(HAVE_DEPS, "selenium/psutil not installed")
+class SystemBusyFlagTest(unittest.TestCase):
+    def make_scraper(self, results):
+        scraper = VisaScraper(email="user@example.com", password="secret", url="https://example.com")
+        scraper.driver = _DaysDriver(results)
+        return scraper
+
+    def test_429_from_days_endpoint_grows_poll_delay(self):
+        scraper = self.make_scraper([429])
+        days = scraper.fetch_available_days([94])
+        self.assertIsNone(days[94])
+        # The calendar fallback must not clear the flag set by the days fetch,
+        # even when the calendar fails to open without a "system busy" page
+        scraper.logged_in = True
+        scraper._open_calendar = lambda: False
+        scraper.check_system_busy_error = lambda: False
+        self.assertIsNone(scraper.check_available_dates())
+        self.assertTrue(scraper.last_check_failed)
+        self.assertTrue(scraper.last_system_busy)
+        self.assertEqual(main.next_poll_delay(5, 5, scraper.last_system_busy, mean_latency=1.0), 10)
+
+    def test_readable_days_leave_flag_clear(self):
+        scraper = self.make_scraper([["2026-03-01", "2026-02-01"]])
+        days = scraper.fetch_available_days([94])
+        self.assertEqual(days[94], ["2026-02-01", "2026-03-01"])
+        self.assertFalse(scraper.last_system_busy)
+
+    def test_unreadable_calendar_marks_check_failed(self):
+        scraper = self.make_scraper([None])
+        self.assertIsNone(scraper.check_available_dates())  # Not logged in: calendar never read
+        self.assertTrue(scraper.last_check_failed)
+
+
+if __name__ == "__main__":
+    unittest.main()
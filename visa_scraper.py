@@ -9,19 +9,125 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable
 from datetime import datetime, date
 import json
 import os
+import psutil
 
 logger = logging.getLogger(__name__)
 
 
+def terminate_process_tree(pid: int, timeout: float = 3.0) -> None:
+    """Terminate a process and all of its children, killing any that outlive the timeout.
+    
+    Used to stop only the chromedriver/Chrome processes started by the bot,
+    leaving any other Chrome windows alone.
+    """
+    try:
+        parent = psutil.Process(pid)
+        procs = parent.children(recursive=True) + [parent]
+    except psutil.NoSuchProcess:
+        return
+    for proc in procs:
+        try:
+            proc.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+# Existing appointment date formats on the Groups page, compiled once
+_APPT_DATE_PATTERNS = (
+    re.compile(r'(\d{1,2})\s+(\w+),\s+(\d{4})'),  # "21 June, 2027"
+    re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})'),   # "21/06/2027"
+    re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'),   # "2027-06-21"
+)
+# English month names/abbreviations -> month number (locale-independent, unlike strptime's %B)
+_MONTHS = {
+    name: number
+    for number, full in enumerate(
+        ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+         'august', 'september', 'october', 'november', 'december'), 1)
+    for name in (full, full[:3])
+}
+_CALENDAR_TITLE_RE = re.compile(r'([A-Za-z]+)\s+(\d{4})')  # "January 2026"
+# Page-source indicators checked after clicking Reschedule
+_BOOKING_ERROR_PATTERNS = tuple(re.compile(p) for p in (r"error", r"failed", r"try again", r"system is busy"))
+_BOOKING_SUCCESS_PATTERNS = tuple(re.compile(p) for p in (
+    r"instructions", r"step.*5", r"appointment.*rescheduled.*success", r"your appointment has been",
+))
+
+# "System is busy" detection (check_system_busy_error)
+_BUSY_ERROR_SELECTOR = ".error, .alert, .alert-box, [class*='error'], [class*='alert']"
+_BUSY_KEYWORDS = ("system is busy", "overloaded", "temporarily unavailable", "try again later")
+# Runs the whole busy check in one WebDriver round trip instead of a find/is_displayed/text
+# call per element plus a page_source download.
+# arguments[0] = error element selector, arguments[1] = lowercase keywords
+# Result: ['element', text] for a visible matching message, ['page', ''] for a match elsewhere, or null
+_BUSY_PROBE_JS = """
+const keywords = arguments[1];
+const matches = text => keywords.some(k => text.includes(k));
+for (const el of document.querySelectorAll(arguments[0])) {
+    const visible = el.offsetWidth || el.offsetHeight || el.getClientRects().length;
+    if (visible && matches((el.innerText || '').toLowerCase())) {
+        return ['element', el.innerText];
+    }
+}
+return matches(document.documentElement.outerHTML.toLowerCase()) ? ['page', ''] : null;
+"""
+
+# Fetches the portal's appointment days JSON from inside the logged-in page, so the
+# browser's cookies, CSRF token and keep-alive connection are reused. All facilities
+# are requested concurrently (Promise.all) in a single WebDriver round trip.
+# arguments[0] = list of facility ids, arguments[1] = async-script callback
+# Result per facility: list of dates, HTTP status (int) on error, or null on network failure
+_FETCH_DAYS_JS = """
+const done = arguments[arguments.length - 1];
+const base = location.pathname.replace(/\\/appointment.*$/, '');
+const csrf = document.querySelector('meta[name="csrf-token"]');
+const headers = {
+    'Accept': 'application/json',
+    'X-Requested-With': 'XMLHttpRequest',
+    'X-CSRF-Token': csrf ? csrf.content : ''
+};
+Promise.all(arguments[0].map(id =>
+    fetch(base + '/appointment/days/' + id + '.json?appointments[expedite]=false',
+          {credentials: 'same-origin', headers: headers})
+        .then(r => r.ok ? r.json() : r.status)
+        .then(days => Array.isArray(days) ? days.map(d => d.date) : days)
+        .catch(() => null)
+)).then(done);
+"""
+
+
+# Explicit waits return as soon as the DOM is ready instead of on Selenium's 500 ms polling boundary.
+# No implicit wait is set on the driver, so the two never compound.
+WAIT_POLL_FREQUENCY = 0.1
+
+# Locators for the reschedule form fields used on every check
+APPT_DATE_LOCATOR = (By.ID, "appointments_consulate_appointment_date")
+FACILITY_SELECT_LOCATOR = (By.ID, "appointments_consulate_appointment_facility_id")
+
+
 class VisaScraper:
     """Handles web scraping and automation for visa appointment website."""
     
-    def __init__(self, email: str, password: str, url: str, headless: bool = False, browser_type: str = 'chrome', max_date: Optional[str] = None):
-        """Initialize the scraper."""
+    def __init__(self, email: str, password: str, url: str, headless: bool = False, browser_type: str = 'chrome', max_date: Optional[str] = None,
+                 on_driver_start: Optional[Callable[[int], None]] = None, poll_frequency: float = WAIT_POLL_FREQUENCY):
+        """Initialize the scraper.
+        
+        Args:
+            on_driver_start: Optional callback receiving the chromedriver PID once the browser is up
+            poll_frequency: Seconds between condition checks in explicit waits (Selenium's default is 0.5)
+        """
+        self.on_driver_start = on_driver_start
+        self.poll_frequency = poll_frequency
         self.email = email
         self.password = password
         self.url = url
@@ -31,10 +137,17 @@ class VisaScraper:
         self.logged_in = False
         self.counselor_selected = False
         self.selected_counselor: Optional[str] = None
+        self.appointment_url: Optional[str] = None  # Reschedule form URL, remembered by navigate_to_reschedule()
+        self.last_system_busy = False  # Set when a date check hits throttling / "system busy"; reset by the caller
+        self.last_check_failed = False  # Whether the last check_available_dates() could not read the calendar
         self.max_date: Optional[date] = None
         if max_date:
             self.set_max_date(max_date)
     
+    def _wait(self, timeout: float) -> WebDriverWait:
+        """Explicit wait on the current driver that re-checks its condition every poll_frequency seconds."""
+        return WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency)
+
     def _setup_driver(self):
         """Set up Selenium WebDriver."""
         try:
@@ -56,17 +169,27 @@ class VisaScraper:
             
             self.driver.maximize_window()
             logger.info("WebDriver initialized successfully")
+            if self.on_driver_start and self.driver_pid:
+                self.on_driver_start(self.driver_pid)
             return True
         except Exception as e:
             logger.error(f"Failed to initialize WebDriver: {e}")
             return False
 
+    @property
+    def driver_pid(self) -> Optional[int]:
+        """PID of the chromedriver process (parent of the Chrome processes it launched)."""
+        try:
+            return self.driver.service.process.pid
+        except AttributeError:
+            return None
+
     def clear_date_field(self) -> bool:
         """Clear the appointment date field value to avoid stale selections."""
         try:
             if not self.driver:
                 return False
-            date_field = self.driver.find_element(By.ID, "appointments_consulate_appointment_date")
+            date_field = self.driver.find_element(*APPT_DATE_LOCATOR)
             self.driver.execute_script(
                 "arguments[0].value=''; arguments[0].dispatchEvent(new Event('change', {bubbles:true}));",
                 date_field
@@ -74,7 +197,7 @@ class VisaScraper:
             logger.info("Cleared appointment date field")
             return True
         except Exception as e:
-            logger.warning(f"Failed to clear appointment date field: {e}")
+            logger.warning("Failed to clear appointment date field: %s", e)
             return False
 
     def _scroll_to_top(self) -> None:
@@ -101,7 +224,7 @@ class VisaScraper:
             for date_format in date_formats:
                 try:
                     self.max_date = datetime.strptime(max_date_str, date_format).date()
-                    logger.info(f"Maximum date set to: {self.max_date}")
+                    logger.info("Maximum date set to: %s", self.max_date)
                     return
                 except ValueError:
                     continue
@@ -136,7 +259,7 @@ class VisaScraper:
             except ValueError:
                 continue
         
-        logger.warning(f"Could not parse date string: {date_str}")
+        logger.warning("Could not parse date string: %s", date_str)
         return None
     
     def _is_date_within_range(self, appointment_date: str) -> bool:
@@ -147,12 +270,12 @@ class VisaScraper:
         parsed_date = self._parse_date(appointment_date)
         if not parsed_date:
             # If we can't parse the date, assume it's valid (better to check than skip)
-            logger.warning(f"Could not parse date '{appointment_date}', assuming valid")
+            logger.warning("Could not parse date '%s', assuming valid", appointment_date)
             return True
         
         is_within_range = parsed_date <= self.max_date
         if not is_within_range:
-            logger.info(f"Date {parsed_date} is after maximum date {self.max_date}, skipping")
+            logger.info("Date %s is after maximum date %s, skipping", parsed_date, self.max_date)
         return is_within_range
     
     def login(self) -> bool:
@@ -162,12 +285,12 @@ class VisaScraper:
                 return False
         
         try:
-            logger.info(f"Navigating to {self.url}")
+            logger.info("Navigating to %s", self.url)
             self.driver.get(self.url)
             time.sleep(3)
             
             # Wait for email field and enter credentials
-            wait = WebDriverWait(self.driver, 20)
+            wait = self._wait(20)
             
             # Try to find email field (adjust selector based on actual website)
             email_selectors = [
@@ -233,13 +356,13 @@ class VisaScraper:
                 
                 # Try to find checkbox - simplest approach first
                 all_checkboxes = self.driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox']")
-                logger.info(f"Found {len(all_checkboxes)} checkbox(es) on the page")
+                logger.info("Found %s checkbox(es) on the page", len(all_checkboxes))
                 
                 for checkbox in all_checkboxes:
                     try:
                         # Check if visible
                         if checkbox.is_displayed():
-                            logger.info(f"Found visible checkbox: id={checkbox.get_attribute('id')}, name={checkbox.get_attribute('name')}")
+                            logger.info("Found visible checkbox: id=%s, name=%s", checkbox.get_attribute('id'), checkbox.get_attribute('name'))
                             
                             # Scroll into view
                             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkbox)
@@ -259,7 +382,7 @@ class VisaScraper:
                                 time.sleep(0.3)
                                 break
                             except Exception as e:
-                                logger.debug(f"Regular click failed: {e}, trying JavaScript click")
+                                logger.debug("Regular click failed: %s, trying JavaScript click", e)
                                 # Try JavaScript click
                                 self.driver.execute_script("arguments[0].click();", checkbox)
                                 logger.info("Clicked checkbox using JavaScript click")
@@ -267,7 +390,7 @@ class VisaScraper:
                                 time.sleep(0.3)
                                 break
                     except Exception as e:
-                        logger.debug(f"Error checking checkbox: {e}")
+                        logger.debug("Error checking checkbox: %s", e)
                         continue
                 
                 # If still not found, try finding via label
@@ -299,7 +422,7 @@ class VisaScraper:
                             except:
                                 continue
                     except Exception as e:
-                        logger.debug(f"Error finding checkbox via label: {e}")
+                        logger.debug("Error finding checkbox via label: %s", e)
                 
             except Exception as e:
                 logger.error(f"Error finding checkbox: {e}")
@@ -374,7 +497,7 @@ class VisaScraper:
             Date string in format 'YYYY-MM-DD' or None if not found
         """
         try:
-            wait = WebDriverWait(self.driver, 10)
+            wait = self._wait(10)
             time.sleep(1)
             
             # Look for consular appointment text
@@ -406,14 +529,8 @@ class VisaScraper:
             
             # Parse date from text like "21 June, 2027, 09:15 Toronto local time at Toronto"
             # Extract date part (before the comma with time)
-            date_patterns = [
-                r'(\d{1,2})\s+(\w+),\s+(\d{4})',  # "21 June, 2027"
-                r'(\d{1,2})/(\d{1,2})/(\d{4})',   # "21/06/2027"
-                r'(\d{4})-(\d{1,2})-(\d{1,2})',   # "2027-06-21"
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, appointment_text)
+            for pattern in _APPT_DATE_PATTERNS:
+                match = pattern.search(appointment_text)
                 if match:
                     if len(match.groups()) == 3:
                         if ',' in appointment_text:  # Format: "21 June, 2027"
@@ -422,18 +539,10 @@ class VisaScraper:
                             year = match.group(3)
                             
                             # Convert month name to number
-                            month_map = {
-                                'january': '01', 'february': '02', 'march': '03', 'april': '04',
-                                'may': '05', 'june': '06', 'july': '07', 'august': '08',
-                                'september': '09', 'october': '10', 'november': '11', 'december': '12',
-                                'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04',
-                                'may': '05', 'jun': '06', 'jul': '07', 'aug': '08',
-                                'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12'
-                            }
-                            month = month_map.get(month_name.lower())
+                            month = _MONTHS.get(month_name.lower())
                             if month:
-                                date_str = f"{year}-{month}-{day.zfill(2)}"
-                                logger.info(f"Extracted appointment date: {date_str}")
+                                date_str = f"{year}-{month:02d}-{day.zfill(2)}"
+                                logger.info("Extracted appointment date: %s", date_str)
                                 return date_str
                         else:  # Numeric format
                             if '/' in appointment_text:  # MM/DD/YYYY or DD/MM/YYYY
@@ -442,22 +551,22 @@ class VisaScraper:
                                     from datetime import datetime
                                     date_obj = datetime.strptime(f"{match.group(1)}/{match.group(2)}/{match.group(3)}", "%d/%m/%Y")
                                     date_str = date_obj.strftime("%Y-%m-%d")
-                                    logger.info(f"Extracted appointment date: {date_str}")
+                                    logger.info("Extracted appointment date: %s", date_str)
                                     return date_str
                                 except:
                                     try:
                                         date_obj = datetime.strptime(f"{match.group(1)}/{match.group(2)}/{match.group(3)}", "%m/%d/%Y")
                                         date_str = date_obj.strftime("%Y-%m-%d")
-                                        logger.info(f"Extracted appointment date: {date_str}")
+                                        logger.info("Extracted appointment date: %s", date_str)
                                         return date_str
                                     except:
                                         pass
                             elif '-' in appointment_text:  # YYYY-MM-DD
                                 date_str = f"{match.group(1)}-{match.group(2).zfill(2)}-{match.group(3).zfill(2)}"
-                                logger.info(f"Extracted appointment date: {date_str}")
+                                logger.info("Extracted appointment date: %s", date_str)
                                 return date_str
             
-            logger.warning(f"Could not parse date from: {appointment_text}")
+            logger.warning("Could not parse date from: %s", appointment_text)
             return None
             
         except Exception as e:
@@ -471,7 +580,7 @@ class VisaScraper:
             return False
         
         try:
-            wait = WebDriverWait(self.driver, 20)
+            wait = self._wait(20)
             time.sleep(2)  # Wait for page to load
             
             # Find Continue button
@@ -511,7 +620,7 @@ class VisaScraper:
     def navigate_to_reschedule(self) -> bool:
         """Navigate to Reschedule Appointment page."""
         try:
-            wait = WebDriverWait(self.driver, 20)
+            wait = self._wait(20)
             
             # First, click the accordion title to expand "Reschedule Appointment" section
             logger.info("Looking for Reschedule Appointment accordion item...")
@@ -573,6 +682,9 @@ class VisaScraper:
                         return False
             
             if reschedule_button:
+                # Remember the target so return_to_search() can load it directly next time
+                self.appointment_url = reschedule_button.get_attribute('href') or self.appointment_url
+                
                 # Scroll into view
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", reschedule_button)
                 time.sleep(0.5)
@@ -597,53 +709,17 @@ class VisaScraper:
             True if system is busy error is found, False otherwise
         """
         try:
-            # Look for error message elements
-            error_selectors = [
-                (By.CLASS_NAME, "error"),
-                (By.CLASS_NAME, "alert"),
-                (By.CLASS_NAME, "alert-box"),
-                (By.CSS_SELECTOR, ".error, .alert, .alert-box, [class*='error'], [class*='alert']"),
-            ]
-            
-            for selector_type, selector_value in error_selectors:
-                try:
-                    error_elements = self.driver.find_elements(selector_type, selector_value)
-                    for error_elem in error_elements:
-                        if error_elem.is_displayed():
-                            error_text = error_elem.text.lower()
-                            busy_keywords = [
-                                "system is busy",
-                                "overloaded",
-                                "temporarily unavailable",
-                                "try again later",
-                                "please try again later"
-                            ]
-                            if any(keyword in error_text for keyword in busy_keywords):
-                                logger.warning(f"System is busy error detected: {error_elem.text}")
-                                return True
-                except:
-                    continue
-            
-            # Also check page source for error messages
-            try:
-                page_text = self.driver.page_source.lower()
-                busy_keywords = [
-                    "system is busy",
-                    "overloaded",
-                    "temporarily unavailable",
-                    "try again later",
-                    "please try again later"
-                ]
-                if any(keyword in page_text for keyword in busy_keywords):
-                    logger.warning("System is busy error detected in page source")
-                    return True
-            except:
-                pass
-            
-            return False
+            hit = self.driver.execute_script(_BUSY_PROBE_JS, _BUSY_ERROR_SELECTOR, list(_BUSY_KEYWORDS))
         except Exception as e:
-            logger.debug(f"Error checking for system busy: {e}")
+            logger.debug("Error checking for system busy: %s", e)
+            return False
+        if not hit:
             return False
+        if hit[0] == 'element':
+            logger.warning("System is busy error detected: %s", hit[1])
+        else:
+            logger.warning("System is busy error detected in page source")
+        return True
     
     def select_location(self, location: str = "Toronto") -> bool:
         """Select consular section location (e.g., Toronto).
@@ -652,12 +728,12 @@ class VisaScraper:
         System busy should only be checked when calendar fails to open.
         """
         try:
-            wait = WebDriverWait(self.driver, 20)
+            wait = self._wait(20)
             
             # Find location dropdown using the specific ID from the HTML
             location_select = None
             try:
-                location_select = wait.until(EC.presence_of_element_located((By.ID, "appointments_consulate_appointment_facility_id")))
+                location_select = wait.until(EC.presence_of_element_located(FACILITY_SELECT_LOCATOR))
                 logger.info("Found location select dropdown")
             except TimeoutException:
                 # Try fallback selectors
@@ -670,7 +746,7 @@ class VisaScraper:
                 for selector in location_selectors:
                     try:
                         location_select = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                        logger.info(f"Found location select using selector: {selector}")
+                        logger.info("Found location select using selector: %s", selector)
                         break
                     except TimeoutException:
                         continue
@@ -682,7 +758,8 @@ class VisaScraper:
                 # Try to select by visible text
                 try:
                     select.select_by_visible_text(location)
-                    logger.info(f"Selected location: {location}")
+                    logger.info("Selected location: %s", location)
+                    self.selected_counselor = location
                     
                     # Don't check for system busy here - wait until we try to open calendar
                     # System busy should only be checked if calendar fails to open
@@ -693,14 +770,15 @@ class VisaScraper:
                     for option in select.options:
                         if location.lower() in option.text.lower():
                             select.select_by_visible_text(option.text)
-                            logger.info(f"Selected location: {option.text}")
+                            logger.info("Selected location: %s", option.text)
+                            self.selected_counselor = location
                             
                             # Don't check for system busy here - wait until we try to open calendar
                             # System busy should only be checked if calendar fails to open
                             
                             return True
                 
-                logger.warning(f"Could not find location option: {location}")
+                logger.warning("Could not find location option: %s", location)
                 return False
             else:
                 logger.warning("Location select not found, may already be selected")
@@ -710,6 +788,69 @@ class VisaScraper:
             logger.error(f"Failed to select location: {e}")
             return False
 
+    def is_on_appointment_page(self) -> bool:
+        """Cheap liveness probe: True if the reschedule form's date field is present.
+        
+        Uses find_elements, which returns immediately when nothing matches (no implicit wait is set).
+        """
+        try:
+            return bool(self.driver and self.driver.find_elements(*APPT_DATE_LOCATOR))
+        except WebDriverException:
+            return False
+
+    def soft_refresh(self) -> bool:
+        """Reload the reschedule page and confirm the session is still valid.
+        
+        Much cheaper than a new browser + login. Returns False if the form does not come back
+        (e.g. the portal redirected to sign-in), in which case the caller should restart the session.
+        """
+        if not self.driver:
+            return False
+        try:
+            self.driver.refresh()
+            self._wait(2).until(
+                EC.presence_of_element_located(APPT_DATE_LOCATOR))
+        except WebDriverException as e:  # includes TimeoutException
+            logger.info("Soft refresh failed, session looks stale: %s", e.__class__.__name__)
+            return False
+        # The reload resets the location dropdown
+        self.selected_counselor = None
+        logger.info("Session refreshed")
+        return True
+
+    def fetch_available_days(self, facility_ids: List[int]) -> Dict[int, Optional[List[str]]]:
+        """Read available dates for several facilities from the portal's JSON days endpoint.
+        
+        Much cheaper than opening and traversing the calendar widget; all facilities
+        are fetched concurrently inside the browser.
+        
+        Returns:
+            Mapping of facility id to a sorted list of YYYY-MM-DD strings, or to None if that
+            facility's days could not be read (callers should fall back to check_available_dates).
+            Sets last_system_busy on HTTP 429/503 but never clears it; the caller resets it per check.
+        """
+        if not self.driver or not facility_ids:
+            return {}
+        try:
+            results = self.driver.execute_async_script(_FETCH_DAYS_JS, list(facility_ids))
+        except WebDriverException as e:
+            logger.warning("Days endpoint fetch failed: %s", e)
+            return {}
+        
+        days_by_facility: Dict[int, Optional[List[str]]] = {}
+        for facility_id, days in zip(facility_ids, results or []):
+            if isinstance(days, list):
+                days_by_facility[facility_id] = sorted(days)
+                continue
+            if isinstance(days, int):
+                # HTTP error status; 429/503 mean the portal is throttling us
+                logger.warning("Days endpoint returned HTTP %s for facility %s", days, facility_id)
+                self.last_system_busy = self.last_system_busy or days in (429, 503)
+            else:
+                logger.warning("Days endpoint returned no usable data for facility %s", facility_id)
+            days_by_facility[facility_id] = None
+        return days_by_facility
+
     def cycle_location(self, target_location: str, alternate_locations: Optional[List[str]] = None) -> bool:
         """Select an alternate location, then switch back to target.
 
@@ -724,7 +865,7 @@ class VisaScraper:
             if not alternate_locations:
                 try:
                     from selenium.webdriver.support.ui import Select
-                    select_elem = self.driver.find_element(By.ID, "appointments_consulate_appointment_facility_id")
+                    select_elem = self.driver.find_element(*FACILITY_SELECT_LOCATOR)
                     select = Select(select_elem)
                     alternate_locations = [
                         option.text.strip()
@@ -732,7 +873,7 @@ class VisaScraper:
                         if option.text.strip() and option.text.strip().lower() != target_location.lower()
                     ]
                 except Exception as e:
-                    logger.debug(f"Failed to read location options from select: {e}")
+                    logger.debug("Failed to read location options from select: %s", e)
                     alternate_locations = []
 
             # Pick the first alternate that isn't the target
@@ -746,7 +887,7 @@ class VisaScraper:
                 logger.warning("No alternate location available to cycle")
                 return False
 
-            logger.info(f"Switching location to {alternate_location} and back to {target_location}")
+            logger.info("Switching location to %s and back to %s", alternate_location, target_location)
 
             # Ensure calendar is closed before changing location
             self._close_calendar_if_open()
@@ -781,7 +922,7 @@ class VisaScraper:
     def go_to_home(self) -> bool:
         """Navigate back to home page by directly navigating to the home URL."""
         try:
-            wait = WebDriverWait(self.driver, 20)
+            wait = self._wait(20)
             logger.info("Navigating to home page...")
             
             # Navigate directly to home URL (like referenced code)
@@ -796,6 +937,23 @@ class VisaScraper:
             logger.error(f"Failed to navigate to home: {e}")
             return False
     
+    def return_to_search(self, location: str) -> bool:
+        """Get back to the reschedule form with the given location selected.
+        
+        Loads the remembered reschedule URL directly (one navigation instead of
+        Home -> Continue -> Reschedule), falling back to the step-by-step chain.
+        """
+        if self.appointment_url:
+            try:
+                self.driver.get(self.appointment_url)
+                if self.is_on_appointment_page():
+                    return self.select_location(location)
+                logger.info("Reschedule URL did not load the appointment form, going through home...")
+            except WebDriverException as e:
+                logger.warning("Direct navigation to reschedule failed: %s", e)
+        return (self.go_to_home() and self.click_continue() and self.navigate_to_reschedule()
+                and self.select_location(location))
+
     def get_available_counselors(self) -> List[Dict[str, str]]:
         """Get list of available counselors/regions (legacy method)."""
         # Return empty list as we now use select_location instead
@@ -812,7 +970,7 @@ class VisaScraper:
         Note: Calendar icon is not directly clickable, so we use JavaScript click directly.
         """
         try:
-            wait = WebDriverWait(self.driver, 10)
+            wait = self._wait(10)
 
             # If calendar is already open, nothing to do
             if self._is_calendar_open():
@@ -822,7 +980,7 @@ class VisaScraper:
             self._scroll_to_top()
             
             # Wait for date field to be present
-            date_field = wait.until(EC.presence_of_element_located((By.ID, "appointments_consulate_appointment_date")))
+            date_field = wait.until(EC.presence_of_element_located(APPT_DATE_LOCATOR))
             
             # Find calendar icon
             calendar_icon_selectors = [
@@ -864,12 +1022,12 @@ class VisaScraper:
         try:
             if not self.driver:
                 return False
-            date_field = self.driver.find_element(By.ID, "appointments_consulate_appointment_date")
+            date_field = self.driver.find_element(*APPT_DATE_LOCATOR)
             self.driver.execute_script("arguments[0].click();", date_field)
             logger.info("Toggled calendar via date field")
             return True
         except Exception as e:
-            logger.debug(f"Failed to toggle calendar: {e}")
+            logger.debug("Failed to toggle calendar: %s", e)
             return False
 
     def _is_calendar_open(self) -> bool:
@@ -908,14 +1066,14 @@ class VisaScraper:
             # Prefer a real click on the location select to dismiss the calendar
             try:
                 self._scroll_to_top()
-                location_select = self.driver.find_element(By.ID, "appointments_consulate_appointment_facility_id")
+                location_select = self.driver.find_element(*FACILITY_SELECT_LOCATOR)
                 ActionChains(self.driver).move_to_element(location_select).click().perform()
             except Exception:
                 pass
 
             # Fallback: click date field toggle
             try:
-                date_field = self.driver.find_element(By.ID, "appointments_consulate_appointment_date")
+                date_field = self.driver.find_element(*APPT_DATE_LOCATOR)
                 ActionChains(self.driver).move_to_element(date_field).click().perform()
             except Exception:
                 pass
@@ -928,7 +1086,7 @@ class VisaScraper:
 
             # Wait for calendar to disappear
             try:
-                WebDriverWait(self.driver, 2).until(
+                self._wait(2).until(
                     EC.invisibility_of_element_located((By.CSS_SELECTOR, ".ui-datepicker, .calendar-popup, .datepicker, [role='dialog'], .yatri-datepicker"))
                 )
                 logger.info("Calendar closed")
@@ -937,7 +1095,7 @@ class VisaScraper:
                 logger.warning("Calendar did not close after click attempts")
                 return False
         except Exception as e:
-            logger.debug(f"Failed to close calendar: {e}")
+            logger.debug("Failed to close calendar: %s", e)
             return False
     
     def _click_next_month(self) -> bool:
@@ -969,7 +1127,7 @@ class VisaScraper:
                             logger.info("Clicked next month button using JavaScript")
                             return True
                         except Exception as e:
-                            logger.debug(f"Error clicking next month with selector {selector}: {e}")
+                            logger.debug("Error clicking next month with selector %s: %s", selector, e)
                             continue
                 except NoSuchElementException:
                     continue
@@ -986,7 +1144,7 @@ class VisaScraper:
         clickable_dates = []
         try:
             # Wait for calendar to be visible (look for calendar popup/overlay)
-            wait = WebDriverWait(self.driver, 5)
+            wait = self._wait(5)
             
             # Common calendar popup selectors
             calendar_popup_selectors = [
@@ -1003,7 +1161,7 @@ class VisaScraper:
                 try:
                     calendar_popup = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
                     if calendar_popup.is_displayed():
-                        logger.info(f"Calendar popup found with selector: {selector}")
+                        logger.info("Calendar popup found with selector: %s", selector)
                         break
                 except TimeoutException:
                     continue
@@ -1035,10 +1193,10 @@ class VisaScraper:
                                 continue
                         
                         if clickable_dates:
-                            logger.info(f"Found {len(clickable_dates)} clickable dates with selector: {selector}")
+                            logger.info("Found %s clickable dates with selector: %s", len(clickable_dates), selector)
                             break
                 except Exception as e:
-                    logger.debug(f"Error with selector {selector}: {e}")
+                    logger.debug("Error with selector %s: %s", selector, e)
                     continue
             
             return clickable_dates
@@ -1067,17 +1225,15 @@ class VisaScraper:
                 return None
 
             title_text = title_element.text.strip()
-            # Expect formats like "January 2026"
-            for fmt in ("%B %Y", "%b %Y"):
-                try:
-                    parsed = datetime.strptime(title_text, fmt)
-                    return date(parsed.year, parsed.month, 1)
-                except ValueError:
-                    continue
-            logger.debug(f"Unrecognized calendar title: {title_text}")
+            # Expect formats like "January 2026" / "Jan 2026"
+            match = _CALENDAR_TITLE_RE.fullmatch(title_text)
+            month = _MONTHS.get(match.group(1).lower()) if match else None
+            if month:
+                return date(int(match.group(2)), month, 1)
+            logger.debug("Unrecognized calendar title: %s", title_text)
             return None
         except Exception as e:
-            logger.debug(f"Failed to read calendar title: {e}")
+            logger.debug("Failed to read calendar title: %s", e)
             return None
 
     def _click_prev_month(self) -> bool:
@@ -1137,8 +1293,11 @@ class VisaScraper:
             logger.error(f"Failed to reset calendar: {e}")
             return False
     
-    def _traverse_calendar_for_clickable_date(self, max_months: int = 24) -> Optional:
-        """Traverse calendar months until a clickable date is found."""
+    def _traverse_calendar_for_clickable_date(self, max_months: int = 24, target: Optional[date] = None) -> Optional:
+        """Traverse calendar months until a clickable date is found.
+        
+        With a target, only that day is returned (None if the calendar doesn't offer it).
+        """
         try:
             # Always reset calendar to current month before traversing
             self._reset_calendar_to_current_month()
@@ -1147,16 +1306,30 @@ class VisaScraper:
             max_months_to_check = max_months
             
             while months_checked < max_months_to_check:
-                # Look for clickable dates in current month
-                clickable_dates = self._find_clickable_dates()
+                if target is not None:
+                    shown = self._get_calendar_month_year()
+                    if shown is None or (shown.year, shown.month) > (target.year, target.month):
+                        logger.warning("Could not reach %s in the calendar", target)
+                        return None
+                    if (shown.year, shown.month) == (target.year, target.month):
+                        day = str(target.day)
+                        for date_element in self._find_clickable_dates():
+                            if date_element.text.strip() == day:
+                                return date_element
+                        logger.warning("Date %s is not clickable in the calendar", target)
+                        return None
+                    clickable_dates = None  # Earlier month: skip its dates
+                else:
+                    # Look for clickable dates in current month
+                    clickable_dates = self._find_clickable_dates()
                 
                 if clickable_dates:
-                    logger.info(f"Found {len(clickable_dates)} clickable dates in current month view")
+                    logger.info("Found %s clickable dates in current month view", len(clickable_dates))
                     # Return the first clickable date
                     return clickable_dates[0]
                 
                 # No clickable dates in current month, try next month
-                logger.info(f"No clickable dates found in current month, clicking next month...")
+                logger.info("No clickable dates found in current month, clicking next month...")
                 if not self._click_next_month():
                     logger.warning("Could not click next month button")
                     break
@@ -1164,10 +1337,10 @@ class VisaScraper:
                 # Small delay to allow calendar to render next month
                 time.sleep(0.2)
                 months_checked += 1
-                logger.info(f"Checked {months_checked} month(s), continuing...")
+                logger.info("Checked %s month(s), continuing...", months_checked)
             
             if months_checked >= max_months_to_check:
-                logger.warning(f"Checked {max_months_to_check} months, no clickable dates found")
+                logger.warning("Checked %s months, no clickable dates found", max_months_to_check)
             
             return None
             
@@ -1188,26 +1361,34 @@ class VisaScraper:
             self.driver.execute_script("arguments[0].click();", date_element)
             
             date_text = date_element.text.strip()
-            logger.info(f"Selected date: {date_text} using JavaScript")
+            logger.info("Selected date: %s using JavaScript", date_text)
             return True
             
         except Exception as e:
             logger.error(f"Error clicking date: {e}")
             return False
     
-    def check_available_dates(self) -> Optional[Dict[str, str]]:
-        """Check for available appointment dates."""
+    def check_available_dates(self, target_date: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Check for available appointment dates.
+        
+        Selects the first clickable date, or only target_date (YYYY-MM-DD) when given,
+        e.g. the date already picked from fetch_available_days.
+        Sets last_system_busy if the calendar is blocked by "system busy"; like fetch_available_days
+        it never clears the flag, so throttling seen earlier in the same check is kept.
+        Sets last_check_failed unless the calendar was actually read (with or without a date).
+        """
+        self.last_check_failed = True
         if not self.logged_in:
             logger.error("Must be logged in to check dates")
             return None
         
         try:
             self._scroll_to_top()
-            wait = WebDriverWait(self.driver, 20)
+            wait = self._wait(20)
             
             # Wait for date/time fields to appear after location selection
             try:
-                date_field = wait.until(EC.presence_of_element_located((By.ID, "appointments_consulate_appointment_date")))
+                date_field = wait.until(EC.presence_of_element_located(APPT_DATE_LOCATOR))
                 logger.info("Date field found, checking calendar...")
             except TimeoutException:
                 logger.warning("Date field not found - calendar may not be loaded")
@@ -1216,7 +1397,7 @@ class VisaScraper:
             # Check if date field already has a value
             date_field_value = date_field.get_attribute('value')
             if date_field_value and date_field_value.strip():
-                logger.info(f"Date field already has a value: {date_field_value}")
+                logger.info("Date field already has a value: %s", date_field_value)
                 # Clear stale value so we can re-open calendar and search properly
                 self.clear_date_field()
             
@@ -1229,6 +1410,7 @@ class VisaScraper:
                 # Only check for system busy error AFTER calendar fails to open
                 if self.check_system_busy_error():
                     logger.error("System is busy error detected - calendar could not be opened")
+                    self.last_system_busy = True
                     return None
                 # If not system busy, it might be another issue (maybe dates not loaded yet)
                 logger.warning("Calendar failed to open, but no system busy error detected. May retry later.")
@@ -1246,11 +1428,13 @@ class VisaScraper:
                 if months_until_max > 0:
                     max_months = min(months_until_max + 1, 24)  # Add 1 to include the month itself
             
-            logger.info(f"Traversing calendar (up to {max_months} months) to find clickable date...")
-            selected_date_element = self._traverse_calendar_for_clickable_date(max_months=max_months)
+            logger.info("Traversing calendar (up to %s months) to find clickable date...", max_months)
+            target = date.fromisoformat(target_date) if target_date else None
+            selected_date_element = self._traverse_calendar_for_clickable_date(max_months=max_months, target=target)
             
             if not selected_date_element:
                 logger.warning("No clickable dates found after traversing calendar")
+                self.last_check_failed = False
                 return None
             
             # Click the selected date
@@ -1259,6 +1443,7 @@ class VisaScraper:
                 date_field_value = date_field.get_attribute('value')
                 location = self.selected_counselor or "Toronto"
                 
+                self.last_check_failed = False
                 return {
                     'date': date_field_value or selected_date_element.text,
                     'location': location,
@@ -1276,7 +1461,7 @@ class VisaScraper:
         """Get list of available times from the time dropdown."""
         available_times = []
         try:
-            wait = WebDriverWait(self.driver, 10)
+            wait = self._wait(10)
             
             # Wait for time dropdown to be populated (it loads after date selection)
             time_select = None
@@ -1303,7 +1488,7 @@ class VisaScraper:
             # Wait for options to be populated (no hard sleep)
             from selenium.webdriver.support.ui import Select
             try:
-                WebDriverWait(self.driver, 5).until(
+                self._wait(5).until(
                     lambda d: len(Select(time_select).options) > 1
                 )
             except TimeoutException:
@@ -1318,7 +1503,7 @@ class VisaScraper:
                         available_times.append(option_text)
 
                 if available_times:
-                    logger.info(f"Found {len(available_times)} available times")
+                    logger.info("Found %s available times", len(available_times))
                     return available_times
             
             logger.warning("No available times found in dropdown")
@@ -1337,7 +1522,7 @@ class VisaScraper:
                           If None or not available, selects first available time.
         """
         try:
-            wait = WebDriverWait(self.driver, 20)
+            wait = self._wait(20)
             
             # Ensure date is selected first (click on date element if provided)
             if 'element' in date_info and date_info['element']:
@@ -1348,7 +1533,7 @@ class VisaScraper:
                     self.driver.execute_script("arguments[0].click();", date_element)
                     logger.info("Clicked on date using JavaScript")
                 except Exception as e:
-                    logger.warning(f"Could not click date element: {e}")
+                    logger.warning("Could not click date element: %s", e)
             
             # Wait for time dropdown to be populated after date selection
             time_select = None
@@ -1369,7 +1554,7 @@ class VisaScraper:
                     if time_select.is_displayed():
                         # Wait for options to be populated (no hard sleep)
                         try:
-                            WebDriverWait(self.driver, 5).until(
+                            self._wait(5).until(
                                 lambda d: len(Select(time_select).options) > 1
                             )
                         except TimeoutException:
@@ -1408,7 +1593,7 @@ class VisaScraper:
             
             if preferred_time:
                 # Try to select preferred time
-                logger.info(f"Attempting to select preferred time: {preferred_time}")
+                logger.info("Attempting to select preferred time: %s", preferred_time)
                 # Normalize preferred time (remove spaces, handle various formats)
                 preferred_normalized = preferred_time.strip().replace(' ', '')
                 
@@ -1427,11 +1612,11 @@ class VisaScraper:
                         if option.is_enabled():
                             try:
                                 select.select_by_visible_text(option_text)
-                                logger.info(f"Selected preferred time: {option_text}")
+                                logger.info("Selected preferred time: %s", option_text)
                                 time_selected = True
                                 break
                             except Exception as e:
-                                logger.warning(f"Could not select preferred time {option_text}: {e}")
+                                logger.warning("Could not select preferred time %s: %s", option_text, e)
                                 continue
                     
                     # Try partial match (e.g., "7:30" matches "07:30")
@@ -1440,15 +1625,15 @@ class VisaScraper:
                         if option.is_enabled():
                             try:
                                 select.select_by_visible_text(option_text)
-                                logger.info(f"Selected time (partial match): {option_text} (preferred: {preferred_time})")
+                                logger.info("Selected time (partial match): %s (preferred: %s)", option_text, preferred_time)
                                 time_selected = True
                                 break
                             except Exception as e:
-                                logger.warning(f"Could not select time {option_text}: {e}")
+                                logger.warning("Could not select time %s: %s", option_text, e)
                                 continue
                 
                 if not time_selected:
-                    logger.warning(f"Preferred time '{preferred_time}' not available, selecting first available time")
+                    logger.warning("Preferred time '%s' not available, selecting first available time", preferred_time)
             
             # If preferred time not selected, select first available time
             if not time_selected:
@@ -1458,11 +1643,11 @@ class VisaScraper:
                     if option_text and option_value and option.is_enabled():
                         try:
                             select.select_by_visible_text(option_text)
-                            logger.info(f"Selected first available time: {option_text}")
+                            logger.info("Selected first available time: %s", option_text)
                             time_selected = True
                             break
                         except Exception as e:
-                            logger.warning(f"Could not select time {option_text}: {e}")
+                            logger.warning("Could not select time %s: %s", option_text, e)
                             continue
             
             if not time_selected:
@@ -1512,7 +1697,7 @@ class VisaScraper:
             try:
                 data_confirm = reschedule_button.get_attribute('data-confirm')
                 if data_confirm:
-                    logger.info(f"Reschedule button has data-confirm attribute: {data_confirm}")
+                    logger.info("Reschedule button has data-confirm attribute: %s", data_confirm)
                     has_data_confirm = True
                     # This will trigger a Foundation reveal modal when clicked
             except:
@@ -1552,14 +1737,14 @@ class VisaScraper:
                                 time.sleep(1)
                                 break
                     except Exception as e:
-                        logger.warning(f"Alternative confirmation method failed: {e}")
+                        logger.warning("Alternative confirmation method failed: %s", e)
                 
                 # Wait for page to navigate or form to submit after confirmation
                 time.sleep(1.5)  # Reduced further for faster processing
                 
                 # Verify booking was successful by checking URL or page content
                 current_url = self.driver.current_url
-                logger.info(f"Current URL after confirmation: {current_url}")
+                logger.info("Current URL after confirmation: %s", current_url)
                 
                 # Check for success indicators first (instructions page is SUCCESS)
                 if '/appointment/instructions' in current_url or 'instructions' in current_url.lower():
@@ -1576,15 +1761,9 @@ class VisaScraper:
                     # Check for error messages
                     try:
                         page_text = self.driver.page_source.lower()
-                        error_indicators = [
-                            r"error",
-                            r"failed",
-                            r"try again",
-                            r"system is busy",
-                        ]
-                        for indicator in error_indicators:
-                            if re.search(indicator, page_text):
-                                logger.warning(f"Found error indicator: {indicator}")
+                        for indicator in _BOOKING_ERROR_PATTERNS:
+                            if indicator.search(page_text):
+                                logger.warning("Found error indicator: %s", indicator.pattern)
                                 return False
                     except:
                         pass
@@ -1595,21 +1774,15 @@ class VisaScraper:
                     try:
                         # Check page content for success indicators
                         page_text = self.driver.page_source.lower()
-                        success_indicators = [
-                            r"instructions",
-                            r"step.*5",
-                            r"appointment.*rescheduled.*success",
-                            r"your appointment has been",
-                        ]
-                        for indicator in success_indicators:
-                            if re.search(indicator, page_text):
-                                logger.info(f"Found success indicator: {indicator}")
+                        for indicator in _BOOKING_SUCCESS_PATTERNS:
+                            if indicator.search(page_text):
+                                logger.info("Found success indicator: %s", indicator.pattern)
                                 return True
                         
                         logger.info("Navigated to different page - assuming success")
                         return True
                     except Exception as e:
-                        logger.warning(f"Error checking success indicators: {e}")
+                        logger.warning("Error checking success indicators: %s", e)
                         # If we navigated away, assume success
                         return True
                     
@@ -1657,13 +1830,13 @@ class VisaScraper:
             True if confirmation was handled, False otherwise
         """
         try:
-            wait = WebDriverWait(self.driver, 3)  # Reduced wait time
+            wait = self._wait(3)  # Reduced wait time
             
             # Try to handle JavaScript alert/confirm dialog first (immediate, no wait)
             try:
                 alert = self.driver.switch_to.alert
                 alert_text = alert.text
-                logger.info(f"Found JavaScript alert: {alert_text}")
+                logger.info("Found JavaScript alert: %s", alert_text)
                 # Accept the alert (click OK/Confirm) immediately
                 alert.accept()
                 logger.info("✅ Accepted JavaScript alert/confirmation")
@@ -1720,9 +1893,9 @@ class VisaScraper:
             for selector in confirmation_selectors:
                 try:
                     # Try to find button immediately (reduced timeout)
-                    confirmation_button = WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+                    confirmation_button = self._wait(1).until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
                     if confirmation_button.is_displayed():
-                        logger.info(f"Found confirmation button with selector: {selector}")
+                        logger.info("Found confirmation button with selector: %s", selector)
                         # Scroll into view and click immediately
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", confirmation_button)
                         time.sleep(0.05)
@@ -1750,9 +1923,9 @@ class VisaScraper:
             for xpath in xpath_selectors:
                 try:
                     # Try to find button immediately (reduced timeout)
-                    confirmation_button = WebDriverWait(self.driver, 1).until(EC.element_to_be_clickable((By.XPATH, xpath)))
+                    confirmation_button = self._wait(1).until(EC.element_to_be_clickable((By.XPATH, xpath)))
                     if confirmation_button.is_displayed() and confirmation_button.is_enabled():
-                        logger.info(f"Found confirmation button with XPath: {xpath}")
+                        logger.info("Found confirmation button with XPath: %s", xpath)
                         # Scroll into view and click immediately
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", confirmation_button)
                         time.sleep(0.05)
@@ -1780,7 +1953,7 @@ class VisaScraper:
                                         # Look for confirm/ok buttons (exclude cancel/close)
                                         if any(word in button_text for word in ['confirm', 'ok']) and \
                                            not any(word in button_text for word in ['cancel', 'close']):
-                                            logger.info(f"Found confirmation button in modal: {button_text}")
+                                            logger.info("Found confirmation button in modal: %s", button_text)
                                             # Scroll into view and click immediately
                                             self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
                                             time.sleep(0.1)
@@ -1793,7 +1966,7 @@ class VisaScraper:
                     except:
                         continue
             except Exception as e:
-                logger.debug(f"Error searching modals: {e}")
+                logger.debug("Error searching modals: %s", e)
             
             logger.warning("Could not find confirmation dialog/button")
             return False